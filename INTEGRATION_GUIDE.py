@@ -19,7 +19,7 @@ Modify scene_planner.py by adding these imports at the top:
 """
 
 # ADD THIS IMPORT
-from cinematic_enhancer import CinematicEnhancer
+from cinematic_enhancer import get_enhancer
 
 """
 Then modify the ScenePlanner class:
@@ -30,13 +30,13 @@ class ScenePlanner:
         self.api_key = api_key or OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = AsyncOpenAI(api_key=self.api_key)
 
         # ADD THIS
         self.use_cinematic_enhancement = use_cinematic_enhancement
-        self.cinematic_enhancer = CinematicEnhancer() if use_cinematic_enhancement else None
+        self.cinematic_enhancer = get_enhancer() if use_cinematic_enhancement else None
 
-    def create_plan(self, script_data, target_scenes=None, scene_duration=None):
+    async def create_plan(self, script_data, target_scenes=None, scene_duration=None):
         """Create a scene-by-scene plan from script"""
         safe_print("🎬 Creating scene plan...")
 
@@ -68,19 +68,19 @@ from script_generator import ScriptGenerator
 from scene_planner import ScenePlanner
 from storyboard_generator import StoryboardGenerator
 from video_generator import VideoGenerator
-from cinematic_enhancer import CinematicEnhancer  # ADD THIS
+from cinematic_enhancer import get_enhancer  # ADD THIS
 
-def generate_video_pipeline(user_prompt):
+async def generate_video_pipeline(user_prompt):
     # Step 1: Generate script
     script_gen = ScriptGenerator()
-    script = script_gen.generate(user_prompt)
+    script = await script_gen.generate(user_prompt)
 
     # Step 2: Create scene plan
     scene_planner = ScenePlanner()
-    scene_plan = scene_planner.create_plan(script)
+    scene_plan = await scene_planner.create_plan(script)
 
     # Step 3: ENHANCE WITH CINEMATICS (ADD THIS)
-    enhancer = CinematicEnhancer()
+    enhancer = get_enhancer()
     scene_plan = enhancer.enhance_scene_plan(scene_plan, user_prompt)
     print("✅ Applied cinematic enhancement to all scenes")
 
@@ -90,7 +90,7 @@ def generate_video_pipeline(user_prompt):
 
     # Step 5: Generate video clips
     video_gen = VideoGenerator()
-    clips = video_gen.generate_clips(scene_plan, storyboard_images=images)
+    clips = await video_gen.generate_clips(scene_plan, storyboard_images=images)
 
     return clips
 
@@ -100,23 +100,23 @@ def generate_video_pipeline(user_prompt):
 # ============================================================
 # Let users choose whether to use cinematic enhancement
 
-def generate_video_pipeline_with_option(user_prompt, use_cinematic=True, 
-                                       cinematic_intensity="high"):
+async def generate_video_pipeline_with_option(user_prompt, use_cinematic=True, 
+                                             cinematic_intensity="high"):
     """
     Args:
         use_cinematic: Enable/disable cinematic enhancement
         cinematic_intensity: "low", "medium", "high" (future feature)
     """
     script_gen = ScriptGenerator()
-    script = script_gen.generate(user_prompt)
+    script = await script_gen.generate(user_prompt)
 
     scene_planner = ScenePlanner()
-    scene_plan = scene_planner.create_plan(script)
+    scene_plan = await scene_planner.create_plan(script)
 
     # Optional cinematic enhancement
     if use_cinematic:
         print(f"🎥 Applying cinematic enhancement (intensity: {cinematic_intensity})...")
-        enhancer = CinematicEnhancer()
+        enhancer = get_enhancer()
         scene_plan = enhancer.enhance_scene_plan(scene_plan, user_prompt)
         print("✅ Cinematic prompting applied")
     else:
@@ -126,7 +126,7 @@ def generate_video_pipeline_with_option(user_prompt, use_cinematic=True,
     images = storyboard_gen.generate(scene_plan)
 
     video_gen = VideoGenerator()
-    clips = video_gen.generate_clips(scene_plan, storyboard_images=images)
+    clips = await video_gen.generate_clips(scene_plan, storyboard_images=images)
 
     return clips
 
@@ -170,7 +170,7 @@ def show_before_after_example():
         print(f"  {scene['visual_description']}")
 
     # Apply cinematic enhancement
-    enhancer = CinematicEnhancer()
+    enhancer = get_enhancer()
     enhanced_plan = enhancer.enhance_scene_plan(
         basic_scene_plan, 
         "Documentary about Mars geology"
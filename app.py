@@ -184,7 +184,15 @@ def generate_video(prompt):
     try:
         ns = st.session_state.get("num_scenes", 5)
         sd = st.session_state.get("scene_duration", 6)
-        result = st.session_state.pipeline.run(prompt, num_scenes=ns, scene_duration=sd, progress_callback=progress_callback)
+        # Repeat prompts are served from the LLM cache unless a fresh take is requested
+        regenerate = st.session_state.get("regenerate", False)
+        result = st.session_state.pipeline.run_sync(
+            prompt,
+            num_scenes=ns,
+            scene_duration=sd,
+            progress_callback=progress_callback,
+            bypass_cache=regenerate
+        )
         st.session_state.result = result
         st.session_state.generating = False
         st.session_state.progress_step = 0
@@ -347,6 +355,11 @@ else:
         )
         st.number_input("Number of scenes", min_value=1, max_value=20, value=5, step=1, key="num_scenes")
         st.number_input("Seconds per scene (max 12)", min_value=2, max_value=12, value=6, step=1, key="scene_duration")
+        st.checkbox(
+            "Regenerate script and scenes",
+            key="regenerate",
+            help="Ignore cached results for this prompt and write a fresh script and scene plan"
+        )
     
     with col2:
         st.markdown("### Quick Examples")
@@ -3,16 +3,7 @@ Audio generation module - converts script to voiceover
 """
 import requests
 from pathlib import Path
-from config import TTS_API_KEY, AUDIO_FORMAT, TEMP_DIR
-
-
-def safe_print(*args, **kwargs):
-    """Safely print messages, handling closed file errors in Streamlit"""
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        # Silently fail if stdout is closed (Streamlit context)
-        pass
+from config import TTS_API_KEY, AUDIO_FORMAT, TEMP_DIR, safe_print
 
 
 class AudioGenerator:
@@ -52,7 +43,7 @@ class AudioGenerator:
             output_dir=output_dir
         )
         
-        safe_print(f"✅ Voiceover generated: {Path(audio_path).name}")
+        safe_print("✅ Voiceover generated: %s", Path(audio_path).name)
         return audio_path
     
     def _generate_elevenlabs(self, text, output_dir):
@@ -10,134 +10,153 @@ This module enriches scene visual descriptions with:
 
 import random
 import json
+import threading
+from functools import lru_cache
 from typing import Dict, List
 
-class CinematicEnhancer:
-    """Enhances visual descriptions with cinematic vocabulary and framing"""
-
-    def __init__(self):
-        # Camera shots optimized for static→video (work well with limited motion)
-        self.establishing_shots = [
-            "Ultra-wide establishing shot",
-            "Sweeping aerial perspective",
-            "Expansive wide-angle view",
-            "Bird's eye establishing view"
+# Camera shots optimized for static→video (work well with limited motion)
+ESTABLISHING_SHOTS = (
+    "Ultra-wide establishing shot",
+    "Sweeping aerial perspective",
+    "Expansive wide-angle view",
+    "Bird's eye establishing view"
+)
+
+MEDIUM_SHOTS = (
+    "Medium shot with shallow depth of field",
+    "Three-quarter view with environmental context",
+    "Balanced medium composition"
+)
+
+CLOSE_SHOTS = (
+    "Intimate close-up",
+    "Macro detail shot",
+    "Extreme close-up revealing texture"
+)
+
+# Lighting conditions that add cinematic quality
+LIGHTING_CONDITIONS = (
+    "golden hour lighting with warm glow",
+    "dramatic volumetric lighting with god rays",
+    "soft diffused natural light",
+    "high-contrast cinematic lighting",
+    "backlit with rim lighting",
+    "ambient atmospheric lighting"
+)
+
+# Camera movements implied through composition (works for I2V)
+MOVEMENT_IMPLICATIONS = (
+    "framed as if camera is slowly pushing in",
+    "composed for gentle drift forward",
+    "perspective suggesting gradual reveal",
+    "framing implies subtle parallax motion",
+    "composed for slow dolly movement",
+    "staged for gentle tracking shot"
+)
+
+# Depth and scale cues (critical for static images)
+DEPTH_CUES = (
+    "with clear foreground, mid-ground, and background layers",
+    "showing atmospheric depth and scale",
+    "emphasizing vast scale through perspective",
+    "with visible depth of field separation",
+    "revealing epic proportions"
+)
+
+# Atmosphere and mood enhancers
+ATMOSPHERE = (
+    "cinematic color grading",
+    "IMAX-quality detail and clarity",
+    "photorealistic with rich textures",
+    "epic documentary cinematography",
+    "stunning visual spectacle"
+)
+
+# Subject-specific enhancement patterns
+SUBJECT_PATTERNS = {
+    "geological": {
+        "keywords": ["rock", "stone", "mountain", "canyon", "cliff", "volcano", "lava", "glacier", "cave", "crystal"],
+        "enhancements": [
+            "revealing geological layers and deep time",
+            "showing ancient rock formations in sharp detail",
+            "emphasizing scale of geological features",
+            "capturing primordial landscape"
         ]
-
-        self.medium_shots = [
-            "Medium shot with shallow depth of field",
-            "Three-quarter view with environmental context",
-            "Balanced medium composition"
+    },
+    "nature": {
+        "keywords": ["forest", "tree", "jungle", "canopy", "wildlife", "animal", "plant", "flower", "meadow"],
+        "enhancements": [
+            "capturing biodiversity and natural beauty",
+            "revealing lush ecosystem details",
+            "emphasizing organic textures and life",
+            "showcasing pristine wilderness"
         ]
-
-        self.close_shots = [
-            "Intimate close-up",
-            "Macro detail shot",
-            "Extreme close-up revealing texture"
+    },
+    "water": {
+        "keywords": ["water", "ocean", "sea", "river", "lake", "wave", "rain", "waterfall", "ice"],
+        "enhancements": [
+            "showing water dynamics and flow",
+            "capturing fluid motion and reflections",
+            "emphasizing aquatic environment",
+            "revealing underwater details"
         ]
-
-        # Lighting conditions that add cinematic quality
-        self.lighting_conditions = [
-            "golden hour lighting with warm glow",
-            "dramatic volumetric lighting with god rays",
-            "soft diffused natural light",
-            "high-contrast cinematic lighting",
-            "backlit with rim lighting",
-            "ambient atmospheric lighting"
+    },
+    "atmospheric": {
+        "keywords": ["sky", "cloud", "storm", "aurora", "sunset", "sunrise", "star", "galaxy", "space"],
+        "enhancements": [
+            "capturing atmospheric phenomena",
+            "showing celestial grandeur",
+            "emphasizing cosmic scale",
+            "revealing sky dynamics"
         ]
-
-        # Camera movements implied through composition (works for I2V)
-        self.movement_implications = [
-            "framed as if camera is slowly pushing in",
-            "composed for gentle drift forward",
-            "perspective suggesting gradual reveal",
-            "framing implies subtle parallax motion",
-            "composed for slow dolly movement",
-            "staged for gentle tracking shot"
+    },
+    "planetary": {
+        "keywords": ["planet", "mars", "moon", "crater", "terrain", "surface", "solar", "orbital"],
+        "enhancements": [
+            "revealing planetary scale and features",
+            "showing extraterrestrial landscape",
+            "emphasizing alien terrain",
+            "capturing otherworldly atmosphere"
         ]
+    }
+}
 
-        # Depth and scale cues (critical for static images)
-        self.depth_cues = [
-            "with clear foreground, mid-ground, and background layers",
-            "showing atmospheric depth and scale",
-            "emphasizing vast scale through perspective",
-            "with visible depth of field separation",
-            "revealing epic proportions"
-        ]
 
-        # Atmosphere and mood enhancers
-        self.atmosphere = [
-            "cinematic color grading",
-            "IMAX-quality detail and clarity",
-            "photorealistic with rich textures",
-            "epic documentary cinematography",
-            "stunning visual spectacle"
-        ]
+@lru_cache(maxsize=1024)
+def _detect_subject_type(description: str) -> str:
+    """Keyword scan behind CinematicEnhancer.detect_subject_type (pure, so memoized)"""
+    description_lower = description.lower()
 
-        # Subject-specific enhancement patterns
-        self.subject_patterns = {
-            "geological": {
-                "keywords": ["rock", "stone", "mountain", "canyon", "cliff", "volcano", "lava", "glacier", "cave", "crystal"],
-                "enhancements": [
-                    "revealing geological layers and deep time",
-                    "showing ancient rock formations in sharp detail",
-                    "emphasizing scale of geological features",
-                    "capturing primordial landscape"
-                ]
-            },
-            "nature": {
-                "keywords": ["forest", "tree", "jungle", "canopy", "wildlife", "animal", "plant", "flower", "meadow"],
-                "enhancements": [
-                    "capturing biodiversity and natural beauty",
-                    "revealing lush ecosystem details",
-                    "emphasizing organic textures and life",
-                    "showcasing pristine wilderness"
-                ]
-            },
-            "water": {
-                "keywords": ["water", "ocean", "sea", "river", "lake", "wave", "rain", "waterfall", "ice"],
-                "enhancements": [
-                    "showing water dynamics and flow",
-                    "capturing fluid motion and reflections",
-                    "emphasizing aquatic environment",
-                    "revealing underwater details"
-                ]
-            },
-            "atmospheric": {
-                "keywords": ["sky", "cloud", "storm", "aurora", "sunset", "sunrise", "star", "galaxy", "space"],
-                "enhancements": [
-                    "capturing atmospheric phenomena",
-                    "showing celestial grandeur",
-                    "emphasizing cosmic scale",
-                    "revealing sky dynamics"
-                ]
-            },
-            "planetary": {
-                "keywords": ["planet", "mars", "moon", "crater", "terrain", "surface", "solar", "orbital"],
-                "enhancements": [
-                    "revealing planetary scale and features",
-                    "showing extraterrestrial landscape",
-                    "emphasizing alien terrain",
-                    "capturing otherworldly atmosphere"
-                ]
-            }
-        }
+    # Count keyword matches for each category
+    matches = {}
+    for category, data in SUBJECT_PATTERNS.items():
+        count = sum(1 for keyword in data["keywords"] if keyword in description_lower)
+        if count > 0:
+            matches[category] = count
 
-    def detect_subject_type(self, description: str) -> str:
-        """Detect the primary subject type from description"""
-        description_lower = description.lower()
+    # Return category with most matches, or "general" if none
+    if matches:
+        return max(matches, key=matches.get)
+    return "general"
+
+
+class CinematicEnhancer:
+    """Enhances visual descriptions with cinematic vocabulary and framing"""
 
-        # Count keyword matches for each category
-        matches = {}
-        for category, data in self.subject_patterns.items():
-            count = sum(1 for keyword in data["keywords"] if keyword in description_lower)
-            if count > 0:
-                matches[category] = count
+    def __init__(self):
+        # Phrase banks are module-level constants, built once at import
+        self.establishing_shots = ESTABLISHING_SHOTS
+        self.medium_shots = MEDIUM_SHOTS
+        self.close_shots = CLOSE_SHOTS
+        self.lighting_conditions = LIGHTING_CONDITIONS
+        self.movement_implications = MOVEMENT_IMPLICATIONS
+        self.depth_cues = DEPTH_CUES
+        self.atmosphere = ATMOSPHERE
+        self.subject_patterns = SUBJECT_PATTERNS
 
-        # Return category with most matches, or "general" if none
-        if matches:
-            return max(matches, key=matches.get)
-        return "general"
+    def detect_subject_type(self, description: str) -> str:
+        """Detect the primary subject type from description"""
+        return _detect_subject_type(description)
 
     def determine_shot_type(self, description: str, scene_number: int, total_scenes: int) -> str:
         """Intelligently select shot type based on description and position"""
@@ -214,6 +233,9 @@ class CinematicEnhancer:
         """
         Enhance all scenes in a scene plan
 
+        Runs locally from the phrase banks above; no API calls are made, so
+        there is nothing to route through the OpenAI Batch API.
+
         Args:
             scene_plan: Scene plan dict with 'scenes' list
             original_user_prompt: Original user request
@@ -246,18 +268,30 @@ class CinematicEnhancer:
         return enhanced_plan
 
 
+_enhancer_singleton = None
+_enhancer_lock = threading.Lock()
+
+
+def get_enhancer() -> CinematicEnhancer:
+    """Shared CinematicEnhancer instance (it holds no per-run state, so one is enough)"""
+    global _enhancer_singleton
+    if _enhancer_singleton is None:
+        with _enhancer_lock:
+            if _enhancer_singleton is None:
+                _enhancer_singleton = CinematicEnhancer()
+    return _enhancer_singleton
+
+
 # Utility functions for integration
 def enhance_for_storyboard(visual_description: str, scene_number: int = 1, 
                           total_scenes: int = 1) -> str:
     """Quick function to enhance a single visual description"""
-    enhancer = CinematicEnhancer()
-    return enhancer.enhance_description(visual_description, scene_number, total_scenes)
+    return get_enhancer().enhance_description(visual_description, scene_number, total_scenes)
 
 
 def enhance_scene_plan_quick(scene_plan: Dict) -> Dict:
     """Quick function to enhance an entire scene plan"""
-    enhancer = CinematicEnhancer()
-    return enhancer.enhance_scene_plan(scene_plan)
+    return get_enhancer().enhance_scene_plan(scene_plan)
 
 
 if __name__ == "__main__":
@@ -75,6 +75,13 @@ For testing without paid APIs:
         help="Generate storyboard images before video generation (for image-to-video mode)"
     )
     
+    parser.add_argument(
+        "--unified",
+        action="store_true",
+        default=None,
+        help="Write the script and plan scenes in a single LLM call (or set USE_UNIFIED=1)"
+    )
+    
     parser.add_argument(
         "--show-metadata",
         action="store_true",
@@ -98,7 +105,8 @@ For testing without paid APIs:
             tts_api_key=args.tts_key,
             video_provider=args.video_provider,
             tts_provider=args.tts_provider,
-            use_storyboard=args.use_storyboard
+            use_storyboard=args.use_storyboard,
+            use_unified=args.unified
         )
         print("✅ Pipeline initialized")
     except Exception as e:
@@ -111,7 +119,7 @@ For testing without paid APIs:
     
     # Generate video
     try:
-        result = pipeline.run(args.prompt, args.output)
+        result = pipeline.run_sync(args.prompt, args.output)
         
         if result["success"]:
             print("\n" + "=" * 70)
@@ -0,0 +1,148 @@
+"""
+Shared API clients - one pooled OpenAI client per pipeline instead of one per module,
+plus the retry and concurrency policy every OpenAI-backed generator uses
+"""
+import asyncio
+import httpx
+import openai
+from openai import AsyncOpenAI
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from config import OPENAI_API_KEY, OPENAI_MODEL, OPENAI_MAX_CONCURRENCY
+from llm_cache import ModelRefusalError, cached_chat
+
+try:
+    import h2  # noqa: F401  (optional: enables HTTP/2 multiplexing in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Sized for the concurrent script/scene fan-out from run_many
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+# Transient API failures worth retrying (429s, 5xx, timeouts, dropped connections)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# Looked up on every attempt, so tests can swap in wait_none() in one place
+RETRY_WAIT = wait_random_exponential(min=1, max=60)
+
+
+def _retry_wait(retry_state):
+    return RETRY_WAIT(retry_state)
+
+
+# Decorator for coroutines that call OpenAI: up to 6 attempts with jittered exponential backoff
+openai_retry = retry(
+    wait=_retry_wait,
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    reraise=True
+)
+
+
+def create_openai_client(api_key=None):
+    """
+    Build an AsyncOpenAI client backed by a pooled httpx connection pool
+    
+    The pool binds to the event loop that first uses it, so share one client
+    between generators driven by the same loop (as VideoPipeline does).
+    
+    Args:
+        api_key (str): OpenAI API key (default: from config)
+        
+    Returns:
+        AsyncOpenAI: Client whose connections are reused across requests
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+        ),
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
+    # max_retries=0: the generators' tenacity backoff is the only retry layer,
+    # otherwise each of its attempts would hide two more SDK retries
+    return AsyncOpenAI(api_key=api_key or OPENAI_API_KEY, http_client=http_client, max_retries=0)
+
+
+class JSONCompletionMixin:
+    """
+    Retried, concurrency-limited JSON chat completions for a generator class
+    
+    The class using it sets self.client, a REQUEST_OPTIONS dict of extra
+    chat.completions.create arguments and a _validate(data) method.
+    """
+    REQUEST_OPTIONS = {}
+    _semaphore = None
+    
+    def _get_semaphore(self):
+        # Created lazily so it binds to the event loop that awaits the request
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        return self._semaphore
+    
+    @openai_retry
+    async def _call_openai(self, messages, bypass_cache=False):
+        """Send one chat completion request, retrying transient failures with backoff"""
+        # The semaphore is held per attempt so backoff sleeps don't occupy a slot.
+        # The response is parsed and validated before it is cached.
+        async with self._get_semaphore():
+            return await cached_chat(
+                self.client,
+                OPENAI_MODEL,
+                messages,
+                bypass_cache=bypass_cache,
+                validate=self._validate,
+                **self.REQUEST_OPTIONS
+            )
+    
+    async def _iter_deltas(self, messages):
+        """Open a streaming completion and yield its text pieces"""
+        stream = await self.client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=messages,
+            stream=True,
+            **self.REQUEST_OPTIONS
+        )
+        refusal = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if getattr(delta, "refusal", None):
+                refusal.append(delta.refusal)
+            elif delta.content:
+                yield delta.content
+        if refusal:
+            raise ModelRefusalError(f"Model refused the request: {''.join(refusal)}")
+    
+    @openai_retry
+    async def _stream_completion(self, messages, on_delta, on_attempt=None):
+        """
+        Stream one completion and return its full text
+        
+        Opening and draining are retried together, so a connection dropped
+        mid-stream starts the request over rather than failing the run. Like
+        _call_openai, the slot is held per attempt and not across backoff sleeps.
+        
+        Args:
+            messages (list): Chat messages
+            on_delta (callable): Given each streamed text piece
+            on_attempt (callable): Optional; called before every attempt, so
+                state built from an abandoned attempt's pieces can be reset
+        """
+        if on_attempt:
+            on_attempt()
+        parts = []
+        async with self._get_semaphore():
+            async for delta in self._iter_deltas(messages):
+                parts.append(delta)
+                on_delta(delta)
+        return "".join(parts)
@@ -24,10 +24,20 @@ BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "output"
 TEMP_DIR = BASE_DIR / "temp"
 
+# Console output (set GEO_TOUR_VERBOSE=0 to silence progress messages, e.g. under Streamlit)
+VERBOSE = os.getenv("GEO_TOUR_VERBOSE", "1") == "1"
+
 # Model settings
 OPENAI_MODEL = "gpt-4o"  # or "gpt-4o-mini" for faster/cheaper
 SCRIPT_MAX_TOKENS = 2000
 SCENE_MAX_TOKENS = 3000
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))  # cap on in-flight chat requests per generator
+UNIFIED_MAX_TOKENS = SCRIPT_MAX_TOKENS + SCENE_MAX_TOKENS
+USE_UNIFIED = os.getenv("USE_UNIFIED", "0") == "1"  # script + scene plan from one completion (unified_planner.py)
+
+# LLM response cache (repeat prompts skip the API call entirely)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_DIR = OUTPUT_DIR / ".llm_cache"
 
 # Video settings
 DEFAULT_VIDEO_DURATION = 30  # seconds
@@ -47,20 +57,34 @@ VIDEO_MODEL = "gen-3-alpha"
 REPLICATE_API_KEY = os.getenv("REPLICATE_API_KEY", os.getenv("VIDEO_API_KEY"))
 REPLICATE_MODEL = "anotherjesse/zeroscope-v2-xl"  # Text-to-video model
 STABILITY_MODEL = "bytedance/seedance-1-pro"  # Default image-to-video model (Replicate)
+VIDEO_CONCURRENCY = int(os.getenv("VIDEO_CONCURRENCY", "4"))  # scene clips generated at once
 
 # Storyboard settings
 STORYBOARD_PROVIDER = "replicate"  # Options: replicate, mock
 STORYBOARD_MODEL = "google/imagen-3"  # Default text-to-image model for storyboards
 USE_STORYBOARD = False  # Default: False for text-to-video, True for image-to-video providers
+STORYBOARD_CONCURRENCY = int(os.getenv("STORYBOARD_CONCURRENCY", "4"))  # storyboard images generated at once
 
-def safe_print(message):
-    """Safely print messages with Unicode characters, handling encoding errors"""
+def safe_print(message="", *args, **kwargs):
+    """
+    Print a progress message unless VERBOSE is off, shared by every module
+    
+    Extra args are %-formatted into message, so nothing is formatted when quiet.
+    Encoding errors fall back to ASCII, and a closed stdout (Streamlit) is ignored.
+    """
+    if not VERBOSE:
+        return
+    if args:
+        message = message % args
     try:
-        print(message)
-    except UnicodeEncodeError:
-        # Fallback to ASCII-safe version
-        safe_message = message.encode('ascii', errors='replace').decode('ascii')
-        print(safe_message)
+        try:
+            print(message, **kwargs)
+        except UnicodeEncodeError:
+            # Fallback to ASCII-safe version
+            print(str(message).encode('ascii', errors='replace').decode('ascii'), **kwargs)
+    except (IOError, OSError, ValueError):
+        # Silently fail if stdout is closed (Streamlit context)
+        pass
 
 def ensure_directories():
     """Create necessary directories if they don't exist"""
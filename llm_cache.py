@@ -0,0 +1,88 @@
+"""
+LLM response cache - stores parsed chat responses on disk so repeated prompts return instantly
+"""
+import hashlib
+import json
+import diskcache
+import orjson
+from config import LLM_CACHE_DIR, LLM_CACHE_ENABLED, safe_print
+
+
+_cache = None
+
+
+class ModelRefusalError(ValueError):
+    """The model declined the request, so structured outputs returned a refusal instead of JSON"""
+
+
+def get_cache():
+    """Return the shared on-disk cache, opening it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(str(LLM_CACHE_DIR))
+    return _cache
+
+
+def cache_key(model, messages, **kwargs):
+    """Hash everything that determines the response: model, full message list and request options"""
+    payload = json.dumps([model, messages, kwargs], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_json_content(text):
+    """Parse a JSON reply, tolerating a surrounding markdown code fence"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text.replace("```json", "").replace("```", "").strip()
+    elif text.startswith("```"):
+        text = text.replace("```", "").strip()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers' handlers still apply
+    return orjson.loads(text)
+
+
+def lookup(model, messages, **kwargs):
+    """Return the stored response for this request, or None on a miss or when caching is off"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return get_cache().get(cache_key(model, messages, **kwargs))
+
+
+def store(model, messages, data, **kwargs):
+    """Save an already validated response for this request"""
+    if LLM_CACHE_ENABLED:
+        get_cache().set(cache_key(model, messages, **kwargs), data)
+
+
+async def cached_chat(client, model, messages, bypass_cache=False, validate=None, **kwargs):
+    """
+    Chat completion with a local content-hash cache in front of it
+
+    Args:
+        client: AsyncOpenAI client
+        model (str): Model name
+        messages (list): Chat messages
+        bypass_cache (bool): Skip the lookup and overwrite any stored response
+        validate (callable): Optional check run on the parsed response; it should
+            raise to reject the response, which is then not cached
+        **kwargs: Extra arguments for chat.completions.create (max_tokens, response_format, ...)
+
+    Returns:
+        dict: Parsed JSON response
+    """
+    if not bypass_cache:
+        cached = lookup(model, messages, **kwargs)
+        if cached is not None:
+            safe_print("⚡ Using cached LLM response")
+            return cached
+
+    response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+    message = response.choices[0].message
+    if message.content is None:
+        raise ModelRefusalError(
+            f"Model refused the request: {getattr(message, 'refusal', None) or 'no content returned'}")
+    data = parse_json_content(message.content)
+    if validate:
+        validate(data)
+
+    store(model, messages, data, **kwargs)
+    return data
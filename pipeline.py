@@ -1,25 +1,60 @@
 """
 Main pipeline orchestrator - coordinates all modules
 """
-import json
+import asyncio
+import functools
+import importlib
+import os
+import shutil
+import threading
 from pathlib import Path
 from datetime import datetime
 
-from config import ensure_directories, OUTPUT_DIR, USE_STORYBOARD
-from script_generator import ScriptGenerator
-from scene_planner_ENHANCED import ScenePlanner
-from storyboard_generator import StoryboardGenerator
-from video_generator import VideoGenerator
-from audio_generator import AudioGenerator
-from video_assembler import VideoAssembler
+import orjson
 
+from config import ensure_directories, OPENAI_API_KEY, OUTPUT_DIR, TEMP_DIR, USE_STORYBOARD, USE_UNIFIED, STORYBOARD_CONCURRENCY, safe_print
 
-def safe_print(*args, **kwargs):
-    """Safely print messages, handling closed file errors in Streamlit"""
+# Generator modules pull in openai, replicate and friends, so they are imported
+# on first use instead of with this module (keeps `import pipeline` cheap)
+_LAZY_IMPORTS = {
+    "create_openai_client": "clients",
+    "ScriptGenerator": "script_generator",
+    "ScenePlanner": "scene_planner_ENHANCED",
+    "UnifiedScriptPlanner": "unified_planner",
+    "StoryboardGenerator": "storyboard_generator",
+    "VideoGenerator": "video_generator",
+    "AudioGenerator": "audio_generator",
+    "VideoAssembler": "video_assembler",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _safe_title(title: str) -> str:
+    """Filesystem-safe form of a video title, used in output filenames"""
+    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_'))
+    return safe_title.replace(' ', '_')[:50]
+
+
+def _load(name):
+    """Import a lazily loaded name; anything already set on the module (e.g. a patch) wins"""
+    value = globals().get(name)
+    if value is None:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return _load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _run_warmup(warmup):
+    # A failed warmup only loses the head start; the real call reports the error
     try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        # Silently fail if stdout is closed (Streamlit context)
+        warmup()
+    except Exception:
         pass
 
 
@@ -33,7 +68,8 @@ class VideoPipeline:
                  use_storyboard=None,
                  svd_model=None,
                  sdxl_model=None,
-                 voice_id=None):
+                 voice_id=None,
+                 use_unified=None):
         """
         Initialize the video generation pipeline
         
@@ -44,20 +80,48 @@ class VideoPipeline:
             video_provider (str): Video generation provider (replicate, runwayml, pika, etc.)
             tts_provider (str): TTS provider (elevenlabs, openai, etc.)
             use_storyboard (bool): Whether to generate storyboard images first (default: from config)
+            use_unified (bool): Write the script and plan scenes in one LLM call (default: from config)
         """
         ensure_directories()
         
-        self.script_gen = ScriptGenerator(openai_api_key)
-        self.scene_planner = ScenePlanner(openai_api_key)
-        self.storyboard_gen = StoryboardGenerator(video_api_key)
-        self.video_gen = VideoGenerator(video_api_key, svd_model=svd_model, sdxl_model=sdxl_model)
-        self.audio_gen = AudioGenerator(tts_api_key, tts_provider, voice_id=locals().get('voice_id'))
-        self.assembler = VideoAssembler()
-        
+        # One pooled OpenAI client shared by every generator this pipeline drives
+        openai_api_key = openai_api_key or OPENAI_API_KEY
+        self.openai_client = _load("create_openai_client")(openai_api_key) if openai_api_key else None
         self.use_storyboard = use_storyboard if use_storyboard is not None else USE_STORYBOARD
+        self.use_unified = use_unified if use_unified is not None else USE_UNIFIED
+        
+        self.script_gen = _load("ScriptGenerator")(openai_api_key, client=self.openai_client)
+        self.scene_planner = _load("ScenePlanner")(openai_api_key, client=self.openai_client)
+        self.unified_planner = _load("UnifiedScriptPlanner")(openai_api_key, client=self.openai_client) if self.use_unified else None
+        # Only imported when storyboards are actually generated
+        self.storyboard_gen = _load("StoryboardGenerator")(video_api_key) if self.use_storyboard else None
+        self.video_gen = _load("VideoGenerator")(video_api_key, svd_model=svd_model, sdxl_model=sdxl_model)
+        self.audio_gen = _load("AudioGenerator")(tts_api_key, tts_provider, voice_id=locals().get('voice_id'))
+        self.assembler = _load("VideoAssembler")()
+        
         self.current_project = None
+        self._loop = None
+        self._last_timestamp = None
+        self._timestamp_count = 0
+        
+        self._start_warmup()
+    
+    def _start_warmup(self):
+        """
+        Warm generator clients in the background so __init__ returns immediately
+        
+        Daemon threads are used so a slow warmup never holds up interpreter exit,
+        and generators without an API key are skipped since there is nothing to fetch.
+        """
+        generators = [self.video_gen, self.audio_gen, self.assembler]
+        if self.use_storyboard:
+            generators.append(self.storyboard_gen)
+        for generator in generators:
+            warmup = getattr(generator, "warmup", None)
+            if warmup and getattr(generator, "api_key", None):
+                threading.Thread(target=_run_warmup, args=(warmup,), name="warmup", daemon=True).start()
     
-    def run(self, user_prompt, output_filename=None, num_scenes=None, scene_duration=None, progress_callback=None):
+    async def run(self, user_prompt, output_filename=None, num_scenes=None, scene_duration=None, progress_callback=None, bypass_cache=False):
         """
         Run the complete pipeline
         
@@ -67,6 +131,7 @@ class VideoPipeline:
             num_scenes (int): Number of scenes to generate
             scene_duration (int): Duration per scene in seconds
             progress_callback (callable): Optional callback for progress updates
+            bypass_cache (bool): Regenerate script and scenes even if this prompt was seen before
             
         Returns:
             dict: Results including paths and metadata
@@ -74,16 +139,73 @@ class VideoPipeline:
         safe_print("\n" + "=" * 70)
         safe_print("🎬 VIDEO GENERATION PIPELINE")
         safe_print("=" * 70)
-        safe_print(f"Prompt: {user_prompt}")
+        safe_print("Prompt: %s", user_prompt)
         safe_print("=" * 70 + "\n")
         
         # Create project data structure
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.current_project = {
+        project = {
             "prompt": user_prompt,
-            "timestamp": timestamp,
+            "timestamp": self._new_timestamp(),
+            "num_scenes": num_scenes,
+            "scene_duration": scene_duration,
             "steps": {}
         }
+        if output_filename:
+            project["output_filename"] = output_filename
+        return await self._run_project(project, progress_callback=progress_callback, bypass_cache=bypass_cache)
+    
+    async def resume(self, metadata_path, progress_callback=None, bypass_cache=False):
+        """
+        Continue a run from its checkpointed metadata file
+        
+        Steps whose results are recorded in the metadata (and whose files still
+        exist) are reused; only the remaining steps are run.
+        
+        Args:
+            metadata_path (str): Path to a project_<timestamp>.json file
+            progress_callback (callable): Optional callback for progress updates
+            bypass_cache (bool): Regenerate script and scenes even if this prompt was seen before
+            
+        Returns:
+            dict: Results including paths and metadata
+        """
+        project = orjson.loads(Path(metadata_path).read_bytes())
+        
+        safe_print("\n" + "=" * 70)
+        safe_print("🎬 VIDEO GENERATION PIPELINE (resumed)")
+        safe_print("=" * 70)
+        safe_print("Prompt: %s", project["prompt"])
+        safe_print("Completed steps: %s", ", ".join(project["steps"]) or "none")
+        safe_print("=" * 70 + "\n")
+        
+        return await self._run_project(project, progress_callback=progress_callback, bypass_cache=bypass_cache)
+    
+    async def _run_project(self, project, progress_callback=None, bypass_cache=False):
+        """Run every step whose result is not already in project["steps"], checkpointing after each one"""
+        self.current_project = project
+        steps = project["steps"]
+        timestamp = project["timestamp"]
+        num_scenes = project.get("num_scenes")
+        scene_duration = project.get("scene_duration")
+        
+        if self._files_exist([steps.get("final_video")]):
+            # Finished project: nothing to redo (its scratch files are already gone)
+            safe_print("⏭️  Final video already exists: %s", steps["final_video"])
+            self._print_summary(project, steps["final_video"])
+            return {
+                "success": True,
+                "video_path": steps["final_video"],
+                "script": steps["script"],
+                "scenes": steps["scenes"],
+                "project_data": project
+            }
+        
+        # Per-run scratch dir so concurrent runs (run_many) don't overwrite each other's clips;
+        # removed once the run succeeds
+        work_dir = TEMP_DIR / timestamp
+        work_dir.mkdir(parents=True, exist_ok=True)
+        audio_task = None
+        storyboard_tasks = []
         
         try:
             # Step 1: Generate script
@@ -91,18 +213,70 @@ class VideoPipeline:
                 progress_callback(1, 6, "📝 Generating script...", "Creating narrative structure")
             safe_print("\n[1/6] Script Generation")
             safe_print("-" * 70)
-            script_data = self.script_gen.generate(user_prompt)
-            self.current_project["steps"]["script"] = script_data
+            def on_title(title):
+                # The title streams in ahead of the narration, so the output name is settled early
+                if "output_filename" not in project:
+                    project["output_filename"] = f"{_safe_title(title)}_{timestamp}.mp4"
+                    safe_print("🏷️  Title: %s", title)
+            
+            unified_plan = None
+            if "script" in steps:
+                script_data = steps["script"]
+                safe_print("⏭️  Reusing checkpointed script")
+            else:
+                if self.use_unified:
+                    # Script and scene plan come back from a single completion
+                    script_data, unified_plan = await self.unified_planner.generate(
+                        project["prompt"],
+                        num_scenes=num_scenes,
+                        scene_duration=scene_duration,
+                        bypass_cache=bypass_cache
+                    )
+                else:
+                    script_data = await self.script_gen.generate(project["prompt"], bypass_cache=bypass_cache, on_title=on_title)
+                steps["script"] = script_data
+                self._checkpoint(project)
             if progress_callback:
                 progress_callback(1, 6, "✅ Script generated", f"Title: {script_data.get('title', 'Untitled')}")
             
+            # The voiceover only needs the script, so it is produced in the background
+            # while scenes, storyboards and clips are generated; step 5 collects it
+            if not self._files_exist([steps.get("audio")]):
+                audio_task = asyncio.create_task(
+                    asyncio.to_thread(self.audio_gen.generate, script_data, output_dir=work_dir)
+                )
+            
             # Step 2: Plan scenes
             if progress_callback:
                 progress_callback(2, 6, "🎬 Planning scenes...", f"Creating {num_scenes or 5} scenes")
             safe_print("\n[2/6] Scene Planning")
             safe_print("-" * 70)
-            scene_plan = self.scene_planner.create_plan(script_data, target_scenes=num_scenes, scene_duration=scene_duration)
-            self.current_project["steps"]["scenes"] = scene_plan
+            if "scenes" in steps:
+                scene_plan = steps["scenes"]
+                safe_print("⏭️  Reusing checkpointed scene plan")
+            else:
+                if unified_plan is not None:
+                    scene_plan = unified_plan
+                else:
+                    on_scene = None
+                    if self.use_storyboard:
+                        storyboard_slots = asyncio.Semaphore(STORYBOARD_CONCURRENCY)
+                        
+                        def on_scene(scene):
+                            # Each storyboard image starts as soon as its scene is planned; step 3 collects them
+                            storyboard_tasks.append(asyncio.create_task(
+                                self._generate_storyboard(scene, work_dir, storyboard_slots)
+                            ))
+                    
+                    scene_plan = await self.scene_planner.create_plan(
+                        script_data,
+                        target_scenes=num_scenes,
+                        scene_duration=scene_duration,
+                        bypass_cache=bypass_cache,
+                        on_scene=on_scene
+                    )
+                steps["scenes"] = scene_plan
+                self._checkpoint(project)
             if progress_callback:
                 progress_callback(2, 6, "✅ Scenes planned", f"{len(scene_plan.get('scenes', []))} scenes created")
             
@@ -113,8 +287,16 @@ class VideoPipeline:
                     progress_callback(3, 6, "🎨 Generating storyboards...", "Creating visual storyboards for each scene")
                 safe_print("\n[3/6] Storyboard Generation")
                 safe_print("-" * 70)
-                storyboard_images = self.storyboard_gen.generate(scene_plan)
-                self.current_project["steps"]["storyboard"] = storyboard_images
+                if not storyboard_tasks and self._files_exist(steps.get("storyboard")):
+                    storyboard_images = steps["storyboard"]
+                    safe_print("⏭️  Reusing checkpointed storyboards")
+                else:
+                    if storyboard_tasks:
+                        storyboard_images = list(await asyncio.gather(*storyboard_tasks))
+                    else:
+                        storyboard_images = await asyncio.to_thread(self.storyboard_gen.generate, scene_plan, output_dir=work_dir)
+                    steps["storyboard"] = storyboard_images
+                    self._checkpoint(project)
                 if progress_callback:
                     progress_callback(3, 6, "✅ Storyboards generated", f"{len(storyboard_images or [])} storyboard images created")
             else:
@@ -128,18 +310,30 @@ class VideoPipeline:
                 progress_callback(4, 6, "🎥 Generating video clips...", "Creating animated video clips for each scene")
             safe_print("\n[4/6] Video Clip Generation")
             safe_print("-" * 70)
-            clip_paths = self.video_gen.generate_clips(scene_plan, storyboard_images=storyboard_images)
-            self.current_project["steps"]["clips"] = clip_paths
+            if self._files_exist(steps.get("clips")):
+                clip_paths = steps["clips"]
+                safe_print("⏭️  Reusing checkpointed video clips")
+            else:
+                clip_paths = await self.video_gen.generate_clips(
+                    scene_plan, output_dir=work_dir, storyboard_images=storyboard_images
+                )
+                steps["clips"] = clip_paths
+                self._checkpoint(project)
             if progress_callback:
                 progress_callback(4, 6, "✅ Video clips generated", f"{len(clip_paths)} video clips created")
             
-            # Step 5: Generate voiceover
+            # Step 5: Collect voiceover (started after step 1)
             if progress_callback:
                 progress_callback(5, 6, "🎙️ Generating voiceover...", "Creating audio narration from script")
             safe_print("\n[5/6] Voiceover Generation")
             safe_print("-" * 70)
-            audio_path = self.audio_gen.generate(script_data)
-            self.current_project["steps"]["audio"] = audio_path
+            if audio_task is None:
+                audio_path = steps["audio"]
+                safe_print("⏭️  Reusing checkpointed voiceover")
+            else:
+                audio_path = await audio_task
+                steps["audio"] = audio_path
+                self._checkpoint(project)
             if progress_callback:
                 progress_callback(5, 6, "✅ Voiceover generated", f"Audio file created: {Path(audio_path).name}")
             
@@ -149,56 +343,179 @@ class VideoPipeline:
             safe_print("\n[6/6] Final Assembly")
             safe_print("-" * 70)
             
-            if not output_filename:
-                safe_title = "".join(c for c in script_data['title'] if c.isalnum() or c in (' ', '-', '_'))
-                safe_title = safe_title.replace(' ', '_')[:50]
-                output_filename = f"{safe_title}_{timestamp}.mp4"
+            output_filename = project.get("output_filename") or f"{_safe_title(script_data['title'])}_{timestamp}.mp4"
+            project["output_filename"] = output_filename
             
             output_path = OUTPUT_DIR / output_filename
-            final_video = self.assembler.assemble(clip_paths, audio_path, output_path)
-            self.current_project["steps"]["final_video"] = final_video
+            on_ffmpeg_line = None
+            if progress_callback:
+                def on_ffmpeg_line(line):
+                    progress_callback(6, 6, "🎬 Assembling final video...", line)
+            
+            final_video = await self.assembler.assemble(
+                clip_paths, audio_path, output_path, work_dir=work_dir, progress_callback=on_ffmpeg_line
+            )
+            steps["final_video"] = final_video
             if progress_callback:
                 progress_callback(6, 6, "✅ Video complete!", f"Final video saved: {output_filename}")
             
-            # Save project metadata
-            self._save_metadata()
+            # The final video lives in OUTPUT_DIR, so the scratch files are done with;
+            # after a failure they are kept for resume() instead. The clip, audio and
+            # storyboard paths stay in the metadata as a record, flagged as deleted.
+            await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
+            project["work_dir_removed"] = True
+            
+            # Save project metadata (written in the background)
+            self._save_metadata(project)
             
             # print summary
-            self._print_summary(final_video)
+            self._print_summary(project, final_video)
             
             return {
                 "success": True,
                 "video_path": final_video,
                 "script": script_data,
                 "scenes": scene_plan,
-                "project_data": self.current_project
+                "project_data": project
             }
             
         except Exception as e:
-            safe_print(f"\n❌ Pipeline failed: {e}")
+            for task in [audio_task, *storyboard_tasks]:
+                self._discard_task(task)
+            safe_print("\n❌ Pipeline failed: %s", e)
+            if steps:
+                safe_print("💾 Completed steps are saved; continue with resume(%r)", str(self._metadata_path(project)))
             return {
                 "success": False,
                 "error": str(e),
-                "project_data": self.current_project
+                "project_data": project
             }
     
-    def _save_metadata(self):
-        """Save project metadata to JSON file"""
-        metadata_path = OUTPUT_DIR / f"project_{self.current_project['timestamp']}.json"
+    async def _generate_storyboard(self, scene, work_dir, semaphore):
+        """Generate one scene's storyboard image in a worker thread, bounded by the shared semaphore"""
+        async with semaphore:
+            return await asyncio.to_thread(self.storyboard_gen.generate_one, scene, output_dir=work_dir)
+    
+    def run_sync(self, *args, **kwargs):
+        """
+        Blocking wrapper around run() for synchronous callers (CLI, Streamlit)
+        
+        The async OpenAI clients keep their connections bound to the event loop
+        that opened them, so every call made through the same pipeline reuses
+        one persistent loop instead of a fresh asyncio.run(). Async callers
+        must likewise drive a pipeline from a single loop.
+        """
+        return self._run_blocking(self.run(*args, **kwargs))
+    
+    def resume_sync(self, metadata_path, **kwargs):
+        """Blocking wrapper around resume(), sharing run_sync()'s event loop"""
+        return self._run_blocking(self.resume(metadata_path, **kwargs))
+    
+    def run_many_sync(self, prompts, **kwargs):
+        """Blocking wrapper around run_many(), sharing run_sync()'s event loop"""
+        return self._run_blocking(self.run_many(prompts, **kwargs))
+    
+    def _run_blocking(self, coro):
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    async def run_many(self, prompts, num_scenes=None, scene_duration=None):
+        """
+        Run the pipeline for several prompts concurrently
+        
+        Use run_many_sync() from synchronous code; wrapping this in asyncio.run()
+        would move the pipeline's pooled clients onto a second event loop.
+        
+        Args:
+            prompts (list): User prompts, one video each
+            num_scenes (int): Number of scenes to generate per video
+            scene_duration (int): Duration per scene in seconds
+            
+        Returns:
+            list: One result dict per prompt, in the same order as prompts
+        """
+        return await asyncio.gather(*[
+            self.run(prompt, num_scenes=num_scenes, scene_duration=scene_duration)
+            for prompt in prompts
+        ])
+    
+    @staticmethod
+    def _discard_task(task):
+        """Cancel a background step that is no longer needed after a failure"""
+        if task is None:
+            return
+        if task.done():
+            # Mark any exception as retrieved; the failure is already being reported
+            if not task.cancelled():
+                task.exception()
+        else:
+            task.cancel()
+    
+    def _new_timestamp(self):
+        """Project timestamp, suffixed when runs started within the same second"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if timestamp == self._last_timestamp:
+            self._timestamp_count += 1
+            return f"{timestamp}_{self._timestamp_count}"
+        self._last_timestamp = timestamp
+        self._timestamp_count = 0
+        return timestamp
+    
+    @staticmethod
+    def _files_exist(paths):
+        """True when a checkpointed step recorded its output files and they are all still on disk"""
+        if paths is None:
+            return False
+        return all(path and Path(path).exists() for path in paths)
+    
+    @staticmethod
+    def _metadata_path(project):
+        return OUTPUT_DIR / f"project_{project['timestamp']}.json"
+    
+    def _checkpoint(self, project):
+        """
+        Write the project metadata after a step completes, so a later failure
+        can be resumed from here instead of paying for finished steps again
+        """
+        data = orjson.dumps(project, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        self._write_metadata(self._metadata_path(project), data, quiet=True)
+    
+    def _save_metadata(self, project):
+        """
+        Save project metadata to JSON file without holding up the caller
         
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(self.current_project, indent=2, fp=f, ensure_ascii=False)
+        The project is serialized immediately (so later changes to the returned
+        dict can't race the write) and written on a background thread. The thread
+        is not a daemon, so the file is still written if the process exits.
         
-        safe_print(f"\n💾 Metadata saved: {metadata_path.name}")
+        Returns:
+            threading.Thread: The writer thread
+        """
+        metadata_path = self._metadata_path(project)
+        data = orjson.dumps(project, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        
+        writer = threading.Thread(target=self._write_metadata, args=(metadata_path, data), name="metadata-writer")
+        writer.start()
+        return writer
+    
+    @staticmethod
+    def _write_metadata(metadata_path, data, quiet=False):
+        # Write then rename, so a crash mid-write never leaves a truncated file behind
+        tmp_path = metadata_path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, metadata_path)
+        if not quiet:
+            safe_print("\n💾 Metadata saved: %s", metadata_path.name)
     
-    def _print_summary(self, video_path):
+    def _print_summary(self, project, video_path):
         """print pipeline completion summary"""
         safe_print("\n" + "=" * 70)
         safe_print("✨ PIPELINE COMPLETE!")
         safe_print("=" * 70)
-        safe_print(f"Title: {self.current_project['steps']['script']['title']}")
-        safe_print(f"Scenes: {len(self.current_project['steps']['scenes']['scenes'])}")
-        safe_print(f"Output: {video_path}")
+        safe_print("Title: %s", project['steps']['script']['title'])
+        safe_print("Scenes: %d", len(project['steps']['scenes']['scenes']))
+        safe_print("Output: %s", video_path)
         safe_print("=" * 70 + "\n")
 
 
@@ -210,9 +527,9 @@ if __name__ == "__main__":
         tts_provider="elevenlabs"
     )
     
-    result = pipeline.run("Explain how photosynthesis works in simple terms")
+    result = pipeline.run_sync("Explain how photosynthesis works in simple terms")
     
     if result["success"]:
-        safe_print(f"✅ Video created: {result['video_path']}")
+        safe_print("✅ Video created: %s", result['video_path'])
     else:
-        safe_print(f"❌ Failed: {result['error']}")
+        safe_print("❌ Failed: %s", result['error'])
@@ -1,30 +1,43 @@
 """
 Scene planning module - breaks scripts into visual scenes
 """
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
 import json
-from config import OPENAI_API_KEY, OPENAI_MODEL, SCENE_MAX_TOKENS, TARGET_SCENES
+from config import OPENAI_API_KEY, SCENE_MAX_TOKENS, TARGET_SCENES, safe_print
+from clients import JSONCompletionMixin
+from system_prompts import CinematicSystemPrompts
+from schemas import ScenePlan, response_format, validate_scenes
 
-def safe_print(*args, **kwargs):
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        pass
 
+REQUEST_OPTIONS = {
+    "max_tokens": SCENE_MAX_TOKENS,
+    "response_format": response_format(ScenePlan),
+}
 
-class ScenePlanner:
-    def __init__(self, api_key=None):
+
+
+class ScenePlanner(JSONCompletionMixin):
+    REQUEST_OPTIONS = REQUEST_OPTIONS
+    
+    def __init__(self, api_key=None, client=None):
         self.api_key = api_key or OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = client or AsyncOpenAI(api_key=self.api_key, max_retries=0)
+    
+    def _validate(self, scene_plan):
+        """Reject plans without scenes or with scenes missing required fields"""
+        validate_scenes(scene_plan.get("scenes"))
+        ScenePlan.model_validate(scene_plan)
     
-    def create_plan(self, script_data, target_scenes=None, scene_duration=None):
+    async def create_plan(self, script_data, target_scenes=None, scene_duration=None, bypass_cache=False):
         """
         Create a scene-by-scene plan from script
         
         Args:
             script_data (dict): Script with title and narration
+            bypass_cache (bool): Ignore any cached plan for this script
             
         Returns:
             dict: Scene plan with visual descriptions and timing
@@ -35,52 +48,26 @@ class ScenePlanner:
         sd = scene_duration or 6
         if sd > 12:
             sd = 12
-        prompt = f"""Break this video script into {ts} scenes with detailed visual descriptions.
+        # Static instructions live in the system message; only this trailing
+        # user message varies per request, keeping the prompt prefix cacheable
+        prompt = f"""Break this video script into {ts} scenes with detailed visual descriptions. Each scene should be {sd} seconds.
 
 Title: {script_data['title']}
-Script: {script_data['script']}
-
-Return ONLY a JSON object with this structure:
-{{
-    "scenes": [
-        {{
-            "scene_number": 1,
-            "narration": "portion of script for this scene",
-            "visual_description": "detailed description of visuals to generate - be specific about what should be shown",
-            "duration": {sd}
-        }}
-    ]
-}}
-
-Each scene should be {sd} seconds. Visual descriptions should be detailed and suitable for AI image/video generation.
-DO NOT include any text outside the JSON."""
+Script: {script_data['script']}"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=OPENAI_MODEL,
-                max_tokens=SCENE_MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse response
-            plan_text = response.choices[0].message.content.strip()
-            scene_plan = json.loads(plan_text)
-            
-            # Validate structure
-            if "scenes" not in scene_plan or not scene_plan["scenes"]:
-                raise ValueError("Invalid scene plan structure")
+            scene_plan = await self._call_openai([
+                {"role": "system", "content": CinematicSystemPrompts.get_scene_plan_format_prompt()},
+                {"role": "user", "content": prompt}
+            ], bypass_cache=bypass_cache)
             
             for scene in scene_plan["scenes"]:
-                required_fields = ["scene_number", "narration", "visual_description", "duration"]
-                if not all(field in scene for field in required_fields):
-                    raise ValueError(f"Scene missing required fields: {scene}")
                 try:
                     scene["duration"] = sd
                 except Exception:
                     pass
             
-            safe_print(f"✅ Created {len(scene_plan['scenes'])} scenes")
+            safe_print("✅ Created %s scenes", len(scene_plan['scenes']))
             return scene_plan
             
         except json.JSONDecodeError as e:
@@ -96,5 +83,5 @@ if __name__ == "__main__":
         "title": "How Rainbows Form",
         "script": "Rainbows appear when sunlight passes through water droplets in the air. The light bends and separates into different colors, creating the beautiful arc we see in the sky."
     }
-    plan = planner.create_plan(test_script)
+    plan = asyncio.run(planner.create_plan(test_script))
     print(json.dumps(plan, indent=2))
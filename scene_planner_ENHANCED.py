@@ -3,40 +3,156 @@ Scene planning module - breaks scripts into visual scenes
 ENHANCED with automatic cinematic prompting
 """
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
 import json
-from config import OPENAI_API_KEY, OPENAI_MODEL, SCENE_MAX_TOKENS, TARGET_SCENES
+import re
+from config import OPENAI_API_KEY, OPENAI_MODEL, SCENE_MAX_TOKENS, TARGET_SCENES, safe_print
+from clients import JSONCompletionMixin
 from system_prompts import CinematicSystemPrompts
+from llm_cache import lookup, parse_json_content, store
+from schemas import ScenePlan, response_format, validate_scene, validate_scenes
 
 # ADDED: Import cinematic enhancer
-from cinematic_enhancer import CinematicEnhancer
-
-def safe_print(*args, **kwargs):
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        pass
-
-class ScenePlanner:
-    def __init__(self, api_key=None, use_cinematic_enhancement=True):
+from cinematic_enhancer import get_enhancer
+
+
+# Options shared by streamed and non-streamed requests so both use the same cache entry
+REQUEST_OPTIONS = {
+    "max_tokens": SCENE_MAX_TOKENS,
+    # Strict schema: the API itself guarantees the {"scenes": [...]} shape
+    "response_format": response_format(ScenePlan),
+}
+
+SCENES_ARRAY_PATTERN = re.compile(r'"scenes"\s*:\s*\[')
+
+
+class SceneStreamParser:
+    """Pulls complete scene objects out of a partially streamed {"scenes": [...]} response"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = None  # index just past the last scene parsed
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, text):
+        """Add streamed text and return any scenes that are now complete"""
+        self.buffer += text
+        scenes = []
+        if self.pos is None:
+            match = SCENES_ARRAY_PATTERN.search(self.buffer)
+            if not match:
+                return scenes
+            self.pos = match.end()
+
+        while True:
+            start = self.pos
+            while start < len(self.buffer) and self.buffer[start] in " \t\r\n,":
+                start += 1
+            self.pos = start
+            # End of the array, or the next scene has not started yet
+            if start >= len(self.buffer) or self.buffer[start] != "{":
+                return scenes
+            try:
+                scene, end = self.decoder.raw_decode(self.buffer, start)
+            except json.JSONDecodeError:
+                # Scene still incomplete; retry once more text arrives
+                return scenes
+            scenes.append(scene)
+            self.pos = end
+
+
+class ScenePlanner(JSONCompletionMixin):
+    REQUEST_OPTIONS = REQUEST_OPTIONS
+
+    def __init__(self, api_key=None, use_cinematic_enhancement=True, client=None):
         """
         Initialize scene planner
 
         Args:
             api_key: OpenAI API key
+            client: Optional shared AsyncOpenAI client (see clients.py)
             use_cinematic_enhancement: If True, automatically enhance visual 
                                       descriptions with cinematic vocabulary
         """
         self.api_key = api_key or OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = client or AsyncOpenAI(api_key=self.api_key, max_retries=0)
 
         # ADDED: Cinematic enhancement
         self.use_cinematic_enhancement = use_cinematic_enhancement
-        self.cinematic_enhancer = CinematicEnhancer() if use_cinematic_enhancement else None
+        self.cinematic_enhancer = get_enhancer() if use_cinematic_enhancement else None
 
-    def create_plan(self, script_data, target_scenes=None, scene_duration=None):
+    async def _stream_plan(self, messages, on_scene, bypass_cache=False):
+        """
+        Stream a scene plan, handing each scene to on_scene as soon as it is complete
+
+        The returned plan holds the same scene objects that were passed to on_scene.
+        The full response is validated and cached once the stream has finished.
+        A dropped stream is retried from the start; scenes already passed to
+        on_scene are kept and only the remaining scene numbers are taken from
+        the retried response.
+        """
+        if not bypass_cache:
+            cached = lookup(OPENAI_MODEL, messages, **REQUEST_OPTIONS)
+            if cached is not None:
+                safe_print("⚡ Using cached LLM response")
+                for scene in cached["scenes"]:
+                    on_scene(scene)
+                return cached
+
+        delivered = []
+        delivered_numbers = set()
+        parser = None
+
+        def on_attempt():
+            # A retried request streams its plan from the start again
+            nonlocal parser
+            parser = SceneStreamParser()
+
+        def deliver(scene):
+            # Scenes an abandoned attempt already handed over are not sent twice
+            if scene["scene_number"] in delivered_numbers:
+                return
+            delivered_numbers.add(scene["scene_number"])
+            on_scene(scene)
+            delivered.append(scene)
+
+        def on_delta(delta):
+            for scene in parser.feed(delta):
+                validate_scene(scene)
+                deliver(scene)
+
+        text = await self._stream_completion(messages, on_delta, on_attempt=on_attempt)
+        scene_plan = parse_json_content(text)
+        self._validate(scene_plan)
+        store(OPENAI_MODEL, messages, scene_plan, **REQUEST_OPTIONS)
+
+        # Hand over anything the incremental parser could not pick out
+        for scene in scene_plan["scenes"]:
+            deliver(scene)
+        scene_plan["scenes"] = sorted(delivered, key=lambda scene: scene["scene_number"])
+        return scene_plan
+
+    def _validate(self, scene_plan):
+        """Reject plans without scenes or with scenes missing required fields"""
+        validate_scenes(scene_plan.get("scenes"))
+
+    def _finish_scene(self, scene, duration, total_scenes, title):
+        """Apply the fixed duration and cinematic enhancement to a single streamed scene"""
+        scene["duration"] = duration
+        if self.use_cinematic_enhancement and self.cinematic_enhancer:
+            original_desc = scene["visual_description"]
+            scene["original_visual_description"] = original_desc
+            scene["visual_description"] = self.cinematic_enhancer.enhance_description(
+                original_desc,
+                scene["scene_number"],
+                total_scenes,
+                title
+            )
+
+    async def create_plan(self, script_data, target_scenes=None, scene_duration=None, bypass_cache=False, on_scene=None):
         """
         Create a scene-by-scene plan from script
 
@@ -44,6 +160,9 @@ class ScenePlanner:
             script_data (dict): Script with title and narration
             target_scenes (int): Number of scenes to create
             scene_duration (int): Duration per scene in seconds
+            bypass_cache (bool): Ignore any cached plan for this script
+            on_scene (callable): Optional callback given each finished (enhanced)
+                scene as soon as it has streamed in, before the plan is complete
 
         Returns:
             dict: Scene plan with visual descriptions and timing
@@ -55,56 +174,41 @@ class ScenePlanner:
         if sd > 12:
             sd = 12
 
-        prompt = f"""Break this video script into {ts} scenes with detailed visual descriptions.
+        # Static instructions live in the system message; only this trailing
+        # user message varies per request, keeping the prompt prefix cacheable
+        prompt = f"""Break this video script into {ts} scenes with detailed visual descriptions. Each scene should be {sd} seconds.
 
 Title: {script_data['title']}
-Script: {script_data['script']}
-
-Return ONLY a JSON object with this structure:
-{{
-  "scenes": [
-    {{
-      "scene_number": 1,
-      "narration": "portion of script for this scene",
-      "visual_description": "detailed description of visuals to generate - be specific about what should be shown",
-      "duration": {sd}
-    }}
-  ]
-}}
-
-Each scene should be {sd} seconds. Visual descriptions should be detailed and suitable for AI image/video generation.
-DO NOT include any text outside the JSON."""
+Script: {script_data['script']}"""
 
         try:
-            response = self.client.chat.completions.create(
-                model=OPENAI_MODEL,
-                max_tokens=SCENE_MAX_TOKENS,
-                messages=[
-                    {"role": "system", "content": CinematicSystemPrompts.get_scene_planning_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"}
-            )
+            # Every scene comes back from this one completion; the cinematic pass
+            # below is local, so planning costs a single round-trip per video.
+            messages = [
+                {"role": "system", "content": CinematicSystemPrompts.get_scene_planning_prompt() + "\n\n" + CinematicSystemPrompts.get_scene_plan_format_prompt()},
+                {"role": "user", "content": prompt}
+            ]
+
+            if on_scene:
+                # Scenes are finished one by one as they stream in
+                def finish_scene(scene):
+                    self._finish_scene(scene, sd, ts, script_data.get('title', ''))
+                    on_scene(scene)
 
-            # Parse response
-            plan_text = response.choices[0].message.content.strip()
-            scene_plan = json.loads(plan_text)
+                scene_plan = await self._stream_plan(messages, finish_scene, bypass_cache=bypass_cache)
+                safe_print("✅ Created %s scenes", len(scene_plan['scenes']))
+                return scene_plan
 
-            # Validate structure
-            if "scenes" not in scene_plan or not scene_plan["scenes"]:
-                raise ValueError("Invalid scene plan structure")
+            scene_plan = await self._call_openai(messages, bypass_cache=bypass_cache)
 
             for scene in scene_plan["scenes"]:
-                required_fields = ["scene_number", "narration", "visual_description", "duration"]
-                if not all(field in scene for field in required_fields):
-                    raise ValueError(f"Scene missing required fields: {scene}")
 
                 try:
                     scene["duration"] = sd
                 except Exception:
                     pass
 
-            safe_print(f"✅ Created {len(scene_plan['scenes'])} scenes")
+            safe_print("✅ Created %s scenes", len(scene_plan['scenes']))
 
             # ADDED: Apply cinematic enhancement
             if self.use_cinematic_enhancement and self.cinematic_enhancer:
@@ -132,7 +236,7 @@ if __name__ == "__main__":
         "script": "Rainbows appear when sunlight passes through water droplets in the air. The light bends and separates into different colors, creating the beautiful arc we see in the sky."
     }
 
-    plan = planner.create_plan(test_script)
+    plan = asyncio.run(planner.create_plan(test_script))
 
     print("\n" + "="*60)
     print("ENHANCED SCENE PLAN OUTPUT")
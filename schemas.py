@@ -0,0 +1,77 @@
+"""
+Response schemas - pydantic models for the JSON the LLM returns
+
+They are sent to OpenAI as strict structured-output schemas, so the API only
+returns JSON of this shape, and are used to check responses on our side.
+"""
+from typing import List
+from pydantic import BaseModel, ConfigDict
+
+
+class Script(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    title: str
+    script: str
+
+
+class Scene(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    scene_number: int
+    narration: str
+    visual_description: str
+    duration: int
+
+
+class ScenePlan(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    scenes: List[Scene]
+
+
+class VideoPlan(BaseModel):
+    """Script and scene plan returned together by the unified planner"""
+    model_config = ConfigDict(extra="forbid")
+
+    title: str
+    script: str
+    scenes: List[Scene]
+
+
+REQUIRED_SCENE_FIELDS = list(Scene.model_fields)
+
+
+def validate_scene(scene):
+    """Reject a scene missing required fields or not matching the Scene schema"""
+    if not all(field in scene for field in REQUIRED_SCENE_FIELDS):
+        raise ValueError(f"Scene missing required fields: {scene}")
+    Scene.model_validate(scene)
+
+
+def validate_scenes(scenes):
+    """Reject an empty scene list or any scene that fails validate_scene"""
+    if not scenes:
+        raise ValueError("Invalid scene plan structure")
+    for scene in scenes:
+        validate_scene(scene)
+
+
+def response_format(model):
+    """
+    Build a strict json_schema response_format for chat.completions.create
+
+    Args:
+        model: Pydantic model class describing the expected response
+
+    Returns:
+        dict: Plain response_format value (also hashable into the LLM cache key)
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": model.model_json_schema(),
+        },
+    }
@@ -1,31 +1,96 @@
 """
 Script generation module - converts user prompts into video scripts
 """
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
 import json
-from config import OPENAI_API_KEY, OPENAI_MODEL, SCRIPT_MAX_TOKENS
+import re
+from config import OPENAI_API_KEY, OPENAI_MODEL, SCRIPT_MAX_TOKENS, safe_print
+from clients import JSONCompletionMixin
 from system_prompts import CinematicSystemPrompts
+from llm_cache import lookup, parse_json_content, store
+from schemas import Script, response_format
 
-def safe_print(*args, **kwargs):
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        pass
+# Options shared by streamed and non-streamed requests so both use the same cache entry
+REQUEST_OPTIONS = {
+    "max_tokens": SCRIPT_MAX_TOKENS,
+    # Strict schema: the API itself guarantees a {"title", "script"} object
+    "response_format": response_format(Script),
+}
 
+# Matches a complete "title" string value in a partially streamed JSON response
+TITLE_PATTERN = re.compile(r'"title"\s*:\s*"((?:[^"\\]|\\.)*)"')
 
-class ScriptGenerator:
-    def __init__(self, api_key=None):
+
+class ScriptGenerator(JSONCompletionMixin):
+    REQUEST_OPTIONS = REQUEST_OPTIONS
+    
+    def __init__(self, api_key=None, client=None):
         self.api_key = api_key or OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = client or AsyncOpenAI(api_key=self.api_key, max_retries=0)
+    
+    def _messages(self, user_prompt):
+        return [
+            {"role": "system", "content": CinematicSystemPrompts.get_script_generation_prompt()},
+            {"role": "user", "content": CinematicSystemPrompts.get_enhanced_user_prompt_wrapper(user_prompt)}
+        ]
     
-    def generate(self, user_prompt):
+    def _validate(self, script_data):
+        """Reject responses missing a non-empty title or script"""
+        if "title" not in script_data or "script" not in script_data:
+            safe_print("❌ Invalid script structure. Received keys: %s", list(script_data.keys()))
+            safe_print("Response preview: %.200s...", json.dumps(script_data))
+            raise ValueError(f"Invalid script structure returned. Expected 'title' and 'script' fields, but got: {list(script_data.keys())}")
+        
+        if not script_data.get("title") or not script_data.get("script"):
+            raise ValueError("Script structure is valid but 'title' or 'script' field is empty")
+        
+        Script.model_validate(script_data)
+    
+    async def _collect_stream(self, user_prompt, on_title, bypass_cache=False):
+        """Stream a script, reporting the title as soon as it is complete"""
+        messages = self._messages(user_prompt)
+        
+        if not bypass_cache:
+            cached = lookup(OPENAI_MODEL, messages, **REQUEST_OPTIONS)
+            if cached is not None:
+                safe_print("⚡ Using cached LLM response")
+                on_title(cached["title"])
+                return cached
+        
+        buffer = []
+        title_sent = False
+        
+        def on_delta(delta):
+            # Reported once, even if a retried attempt streams the title again
+            nonlocal title_sent
+            buffer.append(delta)
+            if not title_sent:
+                match = TITLE_PATTERN.search("".join(buffer))
+                if match:
+                    title_sent = True
+                    on_title(json.loads(f'"{match.group(1)}"'))
+        
+        text = await self._stream_completion(messages, on_delta, on_attempt=buffer.clear)
+        script_data = parse_json_content(text)
+        self._validate(script_data)
+        store(OPENAI_MODEL, messages, script_data, **REQUEST_OPTIONS)
+        return script_data
+    
+    async def generate(self, user_prompt, bypass_cache=False, on_title=None):
         """
         Generate a video script from user prompt
         
+        Independent calls can be awaited together with asyncio.gather; at most
+        OPENAI_MAX_CONCURRENCY requests are in flight at once.
+        
         Args:
             user_prompt (str): User's description of desired video
+            bypass_cache (bool): Ignore any cached response for this prompt
+            on_title (callable): Optional callback given the title as soon as it
+                has streamed in, before the narration is finished
             
         Returns:
             dict: Script data with title and full narration
@@ -43,38 +108,12 @@ Return ONLY a JSON object with this structure:
 Make the script engaging and suitable for narration. DO NOT include any text outside the JSON."""
 
         try:
-            response = self.client.chat.completions.create(
-                model=OPENAI_MODEL,
-                max_tokens=SCRIPT_MAX_TOKENS,
-                messages=[
-                    {"role": "system", "content": CinematicSystemPrompts.get_script_generation_prompt()},
-                    {"role": "user", "content": CinematicSystemPrompts.get_enhanced_user_prompt_wrapper(user_prompt)}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse response
-            script_text = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON if there's extra text
-            if script_text.startswith("```json"):
-                script_text = script_text.replace("```json", "").replace("```", "").strip()
-            elif script_text.startswith("```"):
-                script_text = script_text.replace("```", "").strip()
-            
-            script_data = json.loads(script_text)
-            
-            # Validate structure
-            if "title" not in script_data or "script" not in script_data:
-                safe_print(f"❌ Invalid script structure. Received keys: {list(script_data.keys())}")
-                safe_print(f"Response preview: {script_text[:200]}...")
-                raise ValueError(f"Invalid script structure returned. Expected 'title' and 'script' fields, but got: {list(script_data.keys())}")
-            
-            # Validate that fields are not empty
-            if not script_data.get("title") or not script_data.get("script"):
-                raise ValueError("Script structure is valid but 'title' or 'script' field is empty")
+            if on_title:
+                script_data = await self._collect_stream(user_prompt, on_title, bypass_cache=bypass_cache)
+            else:
+                script_data = await self._call_openai(self._messages(user_prompt), bypass_cache=bypass_cache)
             
-            safe_print(f"✅ Script generated: '{script_data['title']}'")
+            safe_print("✅ Script generated: '%s'", script_data['title'])
             return script_data
             
         except json.JSONDecodeError as e:
@@ -86,5 +125,5 @@ Make the script engaging and suitable for narration. DO NOT include any text out
 if __name__ == "__main__":
     # Test the script generator
     generator = ScriptGenerator()
-    script = generator.generate("Explain how rainbows form")
+    script = asyncio.run(generator.generate("Explain how rainbows form"))
     print(json.dumps(script, indent=2))
@@ -3,24 +3,18 @@ Storyboard generation module - generates storyboard images from scene visual des
 """
 import replicate
 import requests
+import threading
 import time
 from pathlib import Path
-from config import REPLICATE_API_KEY, STORYBOARD_PROVIDER, STORYBOARD_MODEL, TEMP_DIR
-
-
-def safe_print(*args, **kwargs):
-    """Safely print messages, handling closed file errors in Streamlit"""
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        # Silently fail if stdout is closed (Streamlit context)
-        pass
+from config import REPLICATE_API_KEY, STORYBOARD_PROVIDER, STORYBOARD_MODEL, TEMP_DIR, safe_print
 
 
 class StoryboardGenerator:
     def __init__(self, api_key=None, provider=None):
         self.api_key = api_key or REPLICATE_API_KEY
         self.provider = provider or STORYBOARD_PROVIDER
+        self._client = None
+        self._client_lock = threading.Lock()
         
         # Map of supported providers
         self.providers = {
@@ -29,7 +23,19 @@ class StoryboardGenerator:
         
         if self.provider not in self.providers:
             raise ValueError(f"Storyboard provider '{self.provider}' not supported. Available: {list(self.providers.keys())}")
-            
+    
+    def _get_client(self):
+        """Replicate client shared by every scene, so its HTTP connections are reused"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = replicate.Client(api_token=self.api_key)
+            return self._client
+    
+    def warmup(self):
+        """Open the Replicate connection and fetch model metadata before the first image"""
+        if not self.api_key:
+            return
+        self._get_client().models.get(STORYBOARD_MODEL.split(":")[0])
     
     def generate(self, scene_plan, output_dir=None):
         """
@@ -46,34 +52,50 @@ class StoryboardGenerator:
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True)
         
-        safe_print(f"🎨 Generating {len(scene_plan['scenes'])} storyboard images...")
+        safe_print("🎨 Generating %s storyboard images...", len(scene_plan['scenes']))
         
         image_paths = []
-        generator_func = self.providers[self.provider]
         
         for scene in scene_plan['scenes']:
-            safe_print(f"  Scene {scene['scene_number']}: {scene['visual_description'][:50]}...")
-            
-            image_path = generator_func(
-                visual_description=scene['visual_description'],
-                scene_number=scene['scene_number'],
-                output_dir=output_dir
-            )
-            
+            image_path = self.generate_one(scene, output_dir=output_dir)
             image_paths.append(image_path)
         
-        safe_print(f"✅ Generated {len(image_paths)} storyboard images")
+        safe_print("✅ Generated %s storyboard images", len(image_paths))
         return image_paths
     
+    def generate_one(self, scene, output_dir=None):
+        """
+        Generate the storyboard image for a single scene
+        
+        Args:
+            scene (dict): Scene with scene_number and visual_description
+            output_dir (Path): Directory to save the storyboard image
+            
+        Returns:
+            str: Path to the generated storyboard image
+        """
+        output_dir = output_dir or TEMP_DIR
+        output_dir = Path(output_dir)
+        output_dir.mkdir(exist_ok=True)
+        
+        safe_print("  Scene %s: %.50s...", scene['scene_number'], scene['visual_description'])
+        
+        generator_func = self.providers[self.provider]
+        return generator_func(
+            visual_description=scene['visual_description'],
+            scene_number=scene['scene_number'],
+            output_dir=output_dir
+        )
+    
     def _generate_replicate(self, visual_description, scene_number, output_dir):
         """Generate storyboard image using Replicate API"""
         if not self.api_key:
             raise ValueError("No API key provided for storyboard generation. Please set REPLICATE_API_KEY in your .env file.")
         
-        client = replicate.Client(api_token=self.api_key)
+        client = self._get_client()
         
         # Generate storyboard image using selected T2I model
-        safe_print(f"    🎨 Generating image via Replicate...")
+        safe_print("    🎨 Generating image via Replicate...")
         if "google/imagen-3" in STORYBOARD_MODEL:
             output = client.run(
                 STORYBOARD_MODEL,
@@ -98,13 +120,13 @@ class StoryboardGenerator:
             )
         try:
             t = type(output).__name__
-            safe_print(f"    📦 T2I output type: {t}")
+            safe_print("    📦 T2I output type: %s", t)
         except Exception:
             pass
         image_path = output_dir / f"storyboard_scene_{scene_number}.png"
         self._save_image_output(output, image_path)
         
-        safe_print(f"    ✅ Storyboard image saved: {image_path.name}")
+        safe_print("    ✅ Storyboard image saved: %s", image_path.name)
         return str(image_path)
     
     def _download_image(self, url, output_path):
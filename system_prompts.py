@@ -167,19 +167,79 @@ EXAMPLES OF GREAT PROMPTS:
 • "Phases of the moon and how they occur"
 """
 
+    @staticmethod
+    def get_scene_plan_format_prompt():
+        """
+        Output format for scene planner (scene_planner.py)
+        Contains no per-request values, so it can follow the system prompt
+        inside the cached prompt prefix
+        """
+        return """OUTPUT FORMAT - REQUIRED JSON STRUCTURE:
+Return ONLY a JSON object with this structure:
+{
+  "scenes": [
+    {
+      "scene_number": 1,
+      "narration": "portion of script for this scene",
+      "visual_description": "detailed description of visuals to generate - be specific about what should be shown",
+      "duration": 6
+    }
+  ]
+}
+
+Visual descriptions should be detailed and suitable for AI image/video generation.
+DO NOT include any text outside the JSON."""
+
+    @staticmethod
+    def get_unified_planning_prompt():
+        """
+        System prompt for the unified planner (unified_planner.py)
+        Combines the script and scene planning guidance so both come back from
+        one request; its output format replaces the two separate formats
+        """
+        script_rules = CinematicSystemPrompts.get_script_generation_prompt().split("OUTPUT FORMAT")[0].rstrip()
+        scene_rules = CinematicSystemPrompts.get_scene_planning_prompt()
+        return f"""{script_rules}
+
+You then plan the scenes for your own script.
+
+{scene_rules}
+
+OUTPUT FORMAT - REQUIRED JSON STRUCTURE:
+Return ONLY a JSON object with this structure:
+{{
+  "title": "engaging video title",
+  "script": "complete narration script that flows naturally",
+  "scenes": [
+    {{
+      "scene_number": 1,
+      "narration": "portion of script for this scene",
+      "visual_description": "detailed description of visuals to generate - be specific about what should be shown",
+      "duration": 6
+    }}
+  ]
+}}
+
+Taken in order, the scene narrations must add up to the full script.
+DO NOT include any text outside the JSON."""
+
     @staticmethod
     def get_enhanced_user_prompt_wrapper(user_prompt: str) -> str:
         """
         Wraps user prompt with additional context to improve generation
         Use this to preprocess user input before sending to script generator
 
+        The fixed guidance comes first and the user's topic last, so repeated
+        requests share the longest possible prefix with earlier ones
+        (OpenAI caches identical prompt prefixes automatically).
+
         Args:
             user_prompt: Raw user input
 
         Returns:
             Enhanced prompt with guidance
         """
-        return f"""Create a visually-focused documentary video script about: {user_prompt}
+        return f"""Create a visually-focused documentary video script about the topic given at the end of this message.
 
 IMPORTANT REQUIREMENTS:
 - Focus on concrete, observable phenomena that can be visualized
@@ -195,7 +255,9 @@ Return your response as a JSON object with this exact structure:
 {{
     "title": "engaging video title",
     "script": "complete narration script text"
-}}"""
+}}
+
+TOPIC: {user_prompt}"""
 
 
 class HallucinationPrevention:
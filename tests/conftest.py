@@ -7,7 +7,7 @@ import sys
 import os
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, AsyncMock
 
 # Load environment variables from .env file if it exists
 try:
@@ -24,6 +24,48 @@ except ImportError:
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Skip tenacity backoff sleeps so retried API calls don't slow the suite"""
+    from tenacity import wait_none
+    import clients
+    monkeypatch.setattr(clients, "RETRY_WAIT", wait_none())
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Give every test an empty LLM response cache outside the project output dir"""
+    import diskcache
+    import llm_cache
+    cache = diskcache.Cache(str(tmp_path / "llm_cache"))
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def no_pipeline_warmup(monkeypatch):
+    """Stop VideoPipeline from warming real API clients; returns the original method"""
+    import pipeline
+    start_warmup = pipeline.VideoPipeline._start_warmup
+    monkeypatch.setattr(pipeline.VideoPipeline, "_start_warmup", lambda self: None)
+    return start_warmup
+
+
+@pytest.fixture(autouse=True)
+def isolated_pipeline_dirs(tmp_path, monkeypatch):
+    """Keep pipeline checkpoints, final videos and per-run work dirs out of the project tree"""
+    import pipeline
+    output_dir = tmp_path / "output"
+    work_root = tmp_path / "temp"
+    output_dir.mkdir()
+    work_root.mkdir()
+    monkeypatch.setattr(pipeline, "OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(pipeline, "TEMP_DIR", work_root)
+    return output_dir
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test outputs"""
@@ -69,8 +111,9 @@ def sample_scene_plan():
 
 @pytest.fixture
 def mock_openai_client():
-    """Mock OpenAI client for testing"""
+    """Mock AsyncOpenAI client for testing"""
     client = Mock()
+    client.chat.completions.create = AsyncMock()
     message = Mock()
     message.content = json.dumps({
         "title": "Test Video",
@@ -84,6 +127,39 @@ def mock_openai_client():
     return client
 
 
+@pytest.fixture
+def fake_stream():
+    """Factory for fake streamed chat completions that yield the given text pieces"""
+    class FakeStream:
+        def __init__(self, parts, error=None, refusal=None):
+            self.parts = parts
+            self.error = error  # raised after every part has been sent
+            self.refusal = refusal  # sent in place of content, as strict structured outputs do
+            self.sent = 0
+        
+        def __aiter__(self):
+            return self._chunks()
+        
+        async def _chunks(self):
+            for part in self.parts:
+                self.sent += 1
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = part
+                chunk.choices[0].delta.refusal = None
+                yield chunk
+            if self.refusal:
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = None
+                chunk.choices[0].delta.refusal = self.refusal
+                yield chunk
+            if self.error:
+                raise self.error
+    
+    return FakeStream
+
+
 @pytest.fixture
 def mock_replicate_client():
     """Mock Replicate client for testing"""
@@ -0,0 +1,91 @@
+"""
+Tests for llm_cache module
+"""
+import pytest
+import asyncio
+import json
+from unittest.mock import Mock
+from llm_cache import ModelRefusalError, cached_chat, cache_key, parse_json_content
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are a scriptwriter."},
+    {"role": "user", "content": "Explain how rainbows form"}
+]
+
+
+def _set_reply(client, payload):
+    choice = Mock()
+    choice.message.content = json.dumps(payload)
+    response = Mock()
+    response.choices = [choice]
+    client.chat.completions.create.return_value = response
+
+
+def test_cache_key_depends_on_request():
+    """Test the key changes with model, messages and request options"""
+    base = cache_key("gpt-4o", MESSAGES, max_tokens=100)
+    assert base == cache_key("gpt-4o", MESSAGES, max_tokens=100)
+    assert base != cache_key("gpt-4o-mini", MESSAGES, max_tokens=100)
+    assert base != cache_key("gpt-4o", MESSAGES[:1], max_tokens=100)
+    assert base != cache_key("gpt-4o", MESSAGES, max_tokens=200)
+
+
+def test_parse_json_content_strips_code_fence():
+    """Test JSON wrapped in a markdown fence is parsed"""
+    assert parse_json_content('```json\n{"title": "Test"}\n```') == {"title": "Test"}
+    assert parse_json_content('{"title": "Test"}') == {"title": "Test"}
+
+
+def test_cached_chat_hit_skips_api(mock_openai_client):
+    """Test a repeated request is served from the cache"""
+    _set_reply(mock_openai_client, {"title": "Test"})
+    
+    first = asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES))
+    second = asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES))
+    
+    assert first == second == {"title": "Test"}
+    assert mock_openai_client.chat.completions.create.call_count == 1
+
+
+def test_cached_chat_bypass_refreshes(mock_openai_client):
+    """Test bypass_cache calls the API and replaces the stored response"""
+    _set_reply(mock_openai_client, {"title": "Old"})
+    asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES))
+    
+    _set_reply(mock_openai_client, {"title": "New"})
+    refreshed = asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES, bypass_cache=True))
+    cached = asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES))
+    
+    assert refreshed == cached == {"title": "New"}
+    assert mock_openai_client.chat.completions.create.call_count == 2
+
+
+def test_cached_chat_does_not_store_rejected_response(mock_openai_client):
+    """Test responses failing validation are not cached"""
+    def validate(data):
+        if "script" not in data:
+            raise ValueError("missing script")
+    
+    _set_reply(mock_openai_client, {"title": "Test"})
+    for _ in range(2):
+        with pytest.raises(ValueError, match="missing script"):
+            asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES, validate=validate))
+    
+    assert mock_openai_client.chat.completions.create.call_count == 2
+
+
+def test_cached_chat_refusal_raises_and_is_not_cached(mock_openai_client):
+    """Test a structured-output refusal raises a clear error and nothing is stored"""
+    choice = Mock()
+    choice.message.content = None
+    choice.message.refusal = "I can't help with that."
+    response = Mock()
+    response.choices = [choice]
+    mock_openai_client.chat.completions.create.return_value = response
+    
+    for _ in range(2):
+        with pytest.raises(ModelRefusalError, match="I can't help with that"):
+            asyncio.run(cached_chat(mock_openai_client, "gpt-4o", MESSAGES))
+    
+    assert mock_openai_client.chat.completions.create.call_count == 2
@@ -6,7 +6,11 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from pathlib import Path
 from pipeline import VideoPipeline
 
@@ -26,6 +30,17 @@ def test_pipeline_init():
                         assert pipeline is not None
 
 
+def test_pipeline_shares_openai_client():
+    """Test script and scene generation share one pooled OpenAI client"""
+    pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock")
+    
+    assert pipeline.openai_client is not None
+    assert pipeline.script_gen.client is pipeline.openai_client
+    assert pipeline.scene_planner.client is pipeline.openai_client
+    # tenacity owns retries; SDK retries would multiply every attempt
+    assert pipeline.openai_client.max_retries == 0
+
+
 def test_full_pipeline_mock_mode(temp_dir, sample_user_prompt):
     """Test full pipeline execution in mock mode"""
     with patch('script_generator.ScriptGenerator.generate') as mock_script:
@@ -64,7 +79,7 @@ def test_full_pipeline_mock_mode(temp_dir, sample_user_prompt):
                             use_storyboard=False
                         )
                         
-                        result = pipeline.run(sample_user_prompt)
+                        result = pipeline.run_sync(sample_user_prompt)
                         
                         assert result["success"] == True
                         assert "video_path" in result
@@ -113,7 +128,7 @@ def test_pipeline_with_storyboard(temp_dir, sample_user_prompt):
                                 use_storyboard=True
                             )
                             
-                            result = pipeline.run(sample_user_prompt)
+                            result = pipeline.run_sync(sample_user_prompt)
                             
                             assert result["success"] == True
                             assert "storyboard" in result["project_data"]["steps"]
@@ -129,7 +144,7 @@ def test_pipeline_error_handling(sample_user_prompt):
             tts_provider="mock"
         )
         
-        result = pipeline.run(sample_user_prompt)
+        result = pipeline.run_sync(sample_user_prompt)
         
         assert result["success"] == False
         assert "error" in result
@@ -159,8 +174,379 @@ def test_pipeline_metadata_saving(temp_dir, sample_user_prompt):
                             tts_provider="mock"
                         )
                         
-                        result = pipeline.run(sample_user_prompt)
+                        result = pipeline.run_sync(sample_user_prompt)
                         
                         assert result["success"] == True
                         assert "project_data" in result
                         assert "steps" in result["project_data"]
+
+
+def test_pipeline_run_many(temp_dir):
+    """Test run_many returns one result per prompt, in prompt order"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir):
+        pipeline = VideoPipeline(
+            openai_api_key="test-key",
+            video_provider="mock",
+            tts_provider="mock",
+            use_storyboard=False
+        )
+        pipeline.script_gen.generate = AsyncMock(side_effect=lambda prompt, **kwargs: {"title": prompt, "script": "Test"})
+        pipeline.scene_planner.create_plan = AsyncMock(return_value={"scenes": []})
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+        pipeline.audio_gen.generate = Mock(return_value=str(temp_dir / "voiceover.mp3"))
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        
+        results = asyncio.run(pipeline.run_many(["First video", "Second video"]))
+        
+        assert [r["success"] for r in results] == [True, True]
+        assert [r["script"]["title"] for r in results] == ["First video", "Second video"]
+        # Concurrent runs must not share a metadata file
+        timestamps = {r["project_data"]["timestamp"] for r in results}
+        assert len(timestamps) == 2
+
+
+def test_pipeline_sync_wrappers_share_one_loop():
+    """Test run_sync and run_many_sync drive the pipeline from the same event loop"""
+    pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+    loops = []
+    
+    async def fake_script(prompt, **kwargs):
+        loops.append(asyncio.get_running_loop())
+        return {"title": prompt, "script": "Test"}
+    
+    pipeline.script_gen.generate = fake_script
+    pipeline.scene_planner.create_plan = AsyncMock(return_value={"scenes": []})
+    pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+    pipeline.audio_gen.generate = Mock(return_value="voiceover.mp3")
+    pipeline.assembler.assemble = AsyncMock(return_value="final.mp4")
+    
+    pipeline.run_sync("First video")
+    results = pipeline.run_many_sync(["Second video", "Third video"])
+    
+    assert [r["success"] for r in results] == [True, True]
+    assert len(loops) == 3
+    assert len(set(loops)) == 1
+
+
+def test_pipeline_warmup_uses_daemon_threads(no_pipeline_warmup):
+    """Test warmup runs on daemon threads and skips generators without an API key"""
+    pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+    started = threading.Event()
+    
+    def warmup():
+        assert threading.current_thread().daemon
+        started.set()
+    
+    pipeline.video_gen = Mock(api_key="test-key", warmup=warmup)
+    pipeline.audio_gen = Mock(api_key=None)
+    pipeline.assembler = Mock(spec=[])
+    
+    no_pipeline_warmup(pipeline)
+    
+    assert started.wait(timeout=5)
+    pipeline.audio_gen.warmup.assert_not_called()
+
+
+def test_pipeline_starts_storyboards_during_planning(temp_dir):
+    """Test storyboard images are started per scene as the planner delivers them"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir):
+        pipeline = VideoPipeline(
+            openai_api_key="test-key",
+            video_provider="mock",
+            tts_provider="mock",
+            use_storyboard=True
+        )
+        scenes = [
+            {"scene_number": n, "narration": "Test", "visual_description": f"Visual {n}", "duration": 5}
+            for n in (1, 2)
+        ]
+        
+        async def fake_plan(script_data, on_scene=None, **kwargs):
+            for scene in scenes:
+                on_scene(scene)
+            return {"scenes": scenes}
+        
+        pipeline.script_gen.generate = AsyncMock(return_value={"title": "Test", "script": "Test"})
+        pipeline.scene_planner.create_plan = fake_plan
+        pipeline.storyboard_gen.generate = Mock()
+        pipeline.storyboard_gen.generate_one = Mock(side_effect=lambda scene, **kwargs: f"board_{scene['scene_number']}.png")
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+        pipeline.audio_gen.generate = Mock(return_value=str(temp_dir / "voiceover.mp3"))
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        
+        result = pipeline.run_sync("Test prompt")
+        
+        assert result["success"] is True
+        assert result["project_data"]["steps"]["storyboard"] == ["board_1.png", "board_2.png"]
+        pipeline.storyboard_gen.generate.assert_not_called()
+        assert pipeline.video_gen.generate_clips.call_args[1]["storyboard_images"] == ["board_1.png", "board_2.png"]
+
+
+def test_pipeline_metadata_written_in_background(temp_dir):
+    """Test metadata is serialized up front and written by a background thread"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir):
+        pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+        project = {"prompt": "Test", "timestamp": "20240101_000000", "steps": {}}
+        
+        writer = pipeline._save_metadata(project)
+        # Later changes to the project do not leak into the saved file
+        project["steps"]["late"] = True
+        writer.join()
+    
+    saved = json.loads((temp_dir / "project_20240101_000000.json").read_text(encoding="utf-8"))
+    assert saved == {"prompt": "Test", "timestamp": "20240101_000000", "steps": {}}
+
+
+def test_safe_print_quiet_mode(capsys):
+    """Test safe_print formats lazily and every module goes quiet when VERBOSE is off"""
+    import pipeline as pipeline_module
+    import llm_cache
+    import scene_planner_ENHANCED
+    
+    pipeline_module.safe_print("Scenes: %d", 3)
+    assert capsys.readouterr().out == "Scenes: 3\n"
+    
+    with patch('config.VERBOSE', False):
+        pipeline_module.safe_print("Scenes: %d", 3)
+        llm_cache.safe_print("⚡ Using cached LLM response")
+        scene_planner_ENHANCED.safe_print("🎬 Creating scene plan...")
+    assert capsys.readouterr().out == ""
+
+
+def test_pipeline_unified_planning(temp_dir):
+    """Test use_unified routes steps 1 and 2 through a single planner call"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir):
+        pipeline = VideoPipeline(
+            openai_api_key="test-key",
+            tts_provider="mock",
+            use_storyboard=False,
+            use_unified=True
+        )
+        script_data = {"title": "Test", "script": "Test"}
+        scene_plan = {"scenes": [{"scene_number": 1, "narration": "Test", "visual_description": "Visual", "duration": 5}]}
+        
+        pipeline.unified_planner.generate = AsyncMock(return_value=(script_data, scene_plan))
+        pipeline.script_gen.generate = AsyncMock()
+        pipeline.scene_planner.create_plan = AsyncMock()
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+        pipeline.audio_gen.generate = Mock(return_value=str(temp_dir / "voiceover.mp3"))
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        
+        result = pipeline.run_sync("Test prompt", num_scenes=1)
+        
+        assert result["success"] is True
+        assert result["project_data"]["steps"]["scenes"] == scene_plan
+        pipeline.unified_planner.generate.assert_awaited_once()
+        pipeline.script_gen.generate.assert_not_called()
+        pipeline.scene_planner.create_plan.assert_not_called()
+
+
+def test_pipeline_resume_after_failed_assembly(temp_dir):
+    """Test each step is checkpointed and resume reruns only the steps that did not finish"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir), patch('pipeline.TEMP_DIR', temp_dir):
+        pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+        clip_path = temp_dir / "scene_1.mp4"
+        audio_path = temp_dir / "voiceover.mp3"
+        clip_path.write_text("mock")
+        audio_path.write_text("mock")
+        
+        pipeline.script_gen.generate = AsyncMock(return_value={"title": "Test", "script": "Test"})
+        pipeline.scene_planner.create_plan = AsyncMock(return_value={"scenes": [{"scene_number": 1}]})
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[str(clip_path)])
+        pipeline.audio_gen.generate = Mock(return_value=str(audio_path))
+        pipeline.assembler.assemble = AsyncMock(side_effect=RuntimeError("ffmpeg crashed"))
+        
+        result = pipeline.run_sync("Test prompt", num_scenes=1)
+        
+        assert result["success"] is False
+        metadata_path = temp_dir / f"project_{result['project_data']['timestamp']}.json"
+        saved = json.loads(metadata_path.read_text(encoding="utf-8"))
+        assert set(saved["steps"]) == {"script", "scenes", "clips", "audio"}
+        assert saved["num_scenes"] == 1
+        assert not metadata_path.with_suffix(".tmp").exists()
+        
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        resumed = pipeline.resume_sync(metadata_path)
+        
+        assert resumed["success"] is True
+        assert resumed["video_path"] == str(temp_dir / "final.mp4")
+        assert pipeline.script_gen.generate.await_count == 1
+        assert pipeline.scene_planner.create_plan.await_count == 1
+        assert pipeline.video_gen.generate_clips.await_count == 1
+        assert pipeline.audio_gen.generate.call_count == 1
+        assert pipeline.assembler.assemble.call_args[0][:2] == ([str(clip_path)], str(audio_path))
+
+
+def test_pipeline_resume_regenerates_missing_clips(temp_dir):
+    """Test resume reruns a checkpointed step whose files are gone"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir), patch('pipeline.TEMP_DIR', temp_dir):
+        pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+        audio_path = temp_dir / "voiceover.mp3"
+        audio_path.write_text("mock")
+        project = {
+            "prompt": "Test prompt",
+            "timestamp": "20240101_000000",
+            "steps": {
+                "script": {"title": "Test", "script": "Test"},
+                "scenes": {"scenes": [{"scene_number": 1}]},
+                "clips": [str(temp_dir / "deleted.mp4")],
+                "audio": str(audio_path)
+            }
+        }
+        metadata_path = temp_dir / "project_20240101_000000.json"
+        metadata_path.write_text(json.dumps(project), encoding="utf-8")
+        
+        pipeline.script_gen.generate = AsyncMock()
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[str(temp_dir / "scene_1.mp4")])
+        pipeline.audio_gen.generate = Mock()
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        
+        result = pipeline.resume_sync(metadata_path)
+        
+        assert result["success"] is True
+        pipeline.script_gen.generate.assert_not_called()
+        pipeline.audio_gen.generate.assert_not_called()
+        pipeline.video_gen.generate_clips.assert_awaited_once()
+        assert result["project_data"]["steps"]["clips"] == [str(temp_dir / "scene_1.mp4")]
+
+
+def test_pipeline_caps_concurrent_storyboards(temp_dir):
+    """Test storyboard images started during planning respect STORYBOARD_CONCURRENCY"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir), patch('pipeline.STORYBOARD_CONCURRENCY', 2):
+        pipeline = VideoPipeline(
+            openai_api_key="test-key",
+            video_provider="mock",
+            tts_provider="mock",
+            use_storyboard=True
+        )
+        scenes = [
+            {"scene_number": n, "narration": "Test", "visual_description": f"Visual {n}", "duration": 5}
+            for n in range(1, 6)
+        ]
+        lock = threading.Lock()
+        counts = {"in_flight": 0, "peak": 0}
+        
+        def generate_one(scene, **kwargs):
+            with lock:
+                counts["in_flight"] += 1
+                counts["peak"] = max(counts["peak"], counts["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                counts["in_flight"] -= 1
+            return f"board_{scene['scene_number']}.png"
+        
+        async def fake_plan(script_data, on_scene=None, **kwargs):
+            for scene in scenes:
+                on_scene(scene)
+            return {"scenes": scenes}
+        
+        pipeline.script_gen.generate = AsyncMock(return_value={"title": "Test", "script": "Test"})
+        pipeline.scene_planner.create_plan = fake_plan
+        pipeline.storyboard_gen.generate_one = Mock(side_effect=generate_one)
+        pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+        pipeline.audio_gen.generate = Mock(return_value=str(temp_dir / "voiceover.mp3"))
+        pipeline.assembler.assemble = AsyncMock(return_value=str(temp_dir / "final.mp4"))
+        
+        result = pipeline.run_sync("Test prompt")
+        
+        assert result["success"] is True
+        assert len(result["project_data"]["steps"]["storyboard"]) == 5
+        assert counts["peak"] == 2
+
+
+def test_pipeline_resume_completed_project(temp_dir):
+    """Test resuming a finished project reuses the final video instead of reassembling"""
+    with patch('pipeline.OUTPUT_DIR', temp_dir):
+        pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+        paths = {name: temp_dir / name for name in ("scene_1.mp4", "voiceover.mp3", "final.mp4")}
+        for path in paths.values():
+            path.write_text("mock")
+        project = {
+            "prompt": "Test prompt",
+            "timestamp": "20240101_000000",
+            "steps": {
+                "script": {"title": "Test", "script": "Test"},
+                "scenes": {"scenes": [{"scene_number": 1}]},
+                "clips": [str(paths["scene_1.mp4"])],
+                "audio": str(paths["voiceover.mp3"]),
+                "final_video": str(paths["final.mp4"])
+            }
+        }
+        metadata_path = temp_dir / "project_20240101_000000.json"
+        metadata_path.write_text(json.dumps(project), encoding="utf-8")
+        pipeline.assembler.assemble = AsyncMock()
+        
+        result = pipeline.resume_sync(metadata_path)
+        
+        assert result["success"] is True
+        assert result["video_path"] == str(paths["final.mp4"])
+        pipeline.assembler.assemble.assert_not_called()
+
+
+def test_pipeline_removes_work_dir_after_success():
+    """Test the per-run scratch dir is deleted after a successful run and kept after a failure"""
+    import pipeline as pipeline_module
+    
+    pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+    pipeline.script_gen.generate = AsyncMock(return_value={"title": "Test", "script": "Test"})
+    pipeline.scene_planner.create_plan = AsyncMock(return_value={"scenes": []})
+    pipeline.video_gen.generate_clips = AsyncMock(return_value=[])
+    pipeline.audio_gen.generate = Mock(return_value="voiceover.mp3")
+    pipeline.assembler.assemble = AsyncMock(return_value="final.mp4")
+    
+    result = pipeline.run_sync("Test prompt")
+    
+    assert result["success"] is True
+    assert not (pipeline_module.TEMP_DIR / result["project_data"]["timestamp"]).exists()
+    
+    pipeline.assembler.assemble = AsyncMock(side_effect=RuntimeError("ffmpeg crashed"))
+    result = pipeline.run_sync("Test prompt")
+    
+    assert result["success"] is False
+    assert (pipeline_module.TEMP_DIR / result["project_data"]["timestamp"]).is_dir()
+
+
+def test_pipeline_resume_after_success_regenerates_nothing():
+    """Test resuming a finished run returns its video without redoing clips, voiceover or assembly"""
+    import pipeline as pipeline_module
+    
+    pipeline = VideoPipeline(openai_api_key="test-key", tts_provider="mock", use_storyboard=False)
+    
+    def write_clips(scene_plan, output_dir=None, **kwargs):
+        clip = Path(output_dir) / "scene_1.mp4"
+        clip.write_text("mock")
+        return [str(clip)]
+    
+    def write_audio(script_data, output_dir=None):
+        audio = Path(output_dir) / "voiceover.mp3"
+        audio.write_text("mock")
+        return str(audio)
+    
+    async def write_video(clip_paths, audio_path, output_path, **kwargs):
+        Path(output_path).write_text("mock")
+        return str(output_path)
+    
+    pipeline.script_gen.generate = AsyncMock(return_value={"title": "Test", "script": "Test"})
+    pipeline.scene_planner.create_plan = AsyncMock(return_value={"scenes": [{"scene_number": 1}]})
+    pipeline.video_gen.generate_clips = AsyncMock(side_effect=write_clips)
+    pipeline.audio_gen.generate = Mock(side_effect=write_audio)
+    pipeline.assembler.assemble = AsyncMock(side_effect=write_video)
+    
+    result = pipeline.run_sync("Test prompt")
+    assert result["success"] is True
+    metadata_path = pipeline_module.OUTPUT_DIR / f"project_{result['project_data']['timestamp']}.json"
+    for thread in threading.enumerate():
+        if thread.name == "metadata-writer":
+            thread.join()
+    
+    saved = json.loads(metadata_path.read_text(encoding="utf-8"))
+    assert saved["work_dir_removed"] is True
+    
+    resumed = pipeline.resume_sync(metadata_path)
+    
+    assert resumed["success"] is True
+    assert resumed["video_path"] == result["video_path"]
+    assert pipeline.script_gen.generate.await_count == 1
+    assert pipeline.video_gen.generate_clips.await_count == 1
+    assert pipeline.audio_gen.generate.call_count == 1
+    assert pipeline.assembler.assemble.await_count == 1
@@ -2,7 +2,10 @@
 Tests for scene_planner module
 """
 import pytest
+import asyncio
 import json
+import httpx
+import openai
 from unittest.mock import Mock, patch
 from scene_planner import ScenePlanner
 
@@ -23,7 +26,7 @@ def test_scene_planner_init_without_key():
 
 def test_scene_planning_success(mock_openai_client, sample_script):
     """Test successful scene planning"""
-    with patch('scene_planner.OpenAI', return_value=mock_openai_client):
+    with patch('scene_planner.AsyncOpenAI', return_value=mock_openai_client):
         planner = ScenePlanner(api_key="test-key")
         
         # Mock the response
@@ -48,7 +51,7 @@ def test_scene_planning_success(mock_openai_client, sample_script):
         mock_response.choices = [mock_choice]
         mock_openai_client.chat.completions.create.return_value = mock_response
         
-        result = planner.create_plan(sample_script)
+        result = asyncio.run(planner.create_plan(sample_script))
         
         assert "scenes" in result
         assert len(result["scenes"]) == 2
@@ -56,9 +59,38 @@ def test_scene_planning_success(mock_openai_client, sample_script):
         assert "visual_description" in result["scenes"][0]
 
 
+def test_scene_planning_static_prompt_prefix(mock_openai_client, sample_script):
+    """Test per-request values stay out of the system message"""
+    with patch('scene_planner.AsyncOpenAI', return_value=mock_openai_client):
+        planner = ScenePlanner(api_key="test-key")
+        
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = json.dumps({
+            "scenes": [
+                {
+                    "scene_number": 1,
+                    "narration": "Rainbows appear",
+                    "visual_description": "Sunlight rays passing through water droplets",
+                    "duration": 6
+                }
+            ]
+        })
+        mock_response.choices = [mock_choice]
+        mock_openai_client.chat.completions.create.return_value = mock_response
+        
+        for scenes in (3, 5):
+            asyncio.run(planner.create_plan(sample_script, target_scenes=scenes, scene_duration=scenes))
+        
+        first, second = [c.kwargs["messages"] for c in mock_openai_client.chat.completions.create.call_args_list]
+        assert first[0] == second[0]
+        assert sample_script["script"] not in first[0]["content"]
+        assert sample_script["script"] in first[-1]["content"]
+
+
 def test_scene_planning_invalid_structure(mock_openai_client, sample_script):
     """Test scene planning with invalid structure"""
-    with patch('scene_planner.OpenAI', return_value=mock_openai_client):
+    with patch('scene_planner.AsyncOpenAI', return_value=mock_openai_client):
         planner = ScenePlanner(api_key="test-key")
         
         mock_response = Mock()
@@ -68,12 +100,12 @@ def test_scene_planning_invalid_structure(mock_openai_client, sample_script):
         mock_openai_client.chat.completions.create.return_value = mock_response
         
         with pytest.raises(ValueError, match="Invalid scene plan structure"):
-            planner.create_plan(sample_script)
+            asyncio.run(planner.create_plan(sample_script))
 
 
 def test_scene_planning_missing_fields(mock_openai_client, sample_script):
     """Test scene planning with missing required fields"""
-    with patch('scene_planner.OpenAI', return_value=mock_openai_client):
+    with patch('scene_planner.AsyncOpenAI', return_value=mock_openai_client):
         planner = ScenePlanner(api_key="test-key")
         
         mock_response = Mock()
@@ -91,12 +123,12 @@ def test_scene_planning_missing_fields(mock_openai_client, sample_script):
         mock_openai_client.chat.completions.create.return_value = mock_response
         
         with pytest.raises(ValueError, match="Scene missing required fields"):
-            planner.create_plan(sample_script)
+            asyncio.run(planner.create_plan(sample_script))
 
 
 def test_scene_planning_invalid_json(mock_openai_client, sample_script):
     """Test scene planning with invalid JSON"""
-    with patch('scene_planner.OpenAI', return_value=mock_openai_client):
+    with patch('scene_planner.AsyncOpenAI', return_value=mock_openai_client):
         planner = ScenePlanner(api_key="test-key")
         
         mock_response = Mock()
@@ -106,4 +138,102 @@ def test_scene_planning_invalid_json(mock_openai_client, sample_script):
         mock_openai_client.chat.completions.create.return_value = mock_response
         
         with pytest.raises(ValueError, match="Failed to parse scene plan"):
-            planner.create_plan(sample_script)
+            asyncio.run(planner.create_plan(sample_script))
+
+
+def test_enhanced_scene_planning_streams_scenes(mock_openai_client, sample_script, fake_stream):
+    """Test the enhanced planner hands each scene to on_scene before the plan is complete"""
+    import scene_planner_ENHANCED
+    
+    payload = json.dumps({
+        "scenes": [
+            {"scene_number": n, "narration": f"Narration {n}", "visual_description": f"Visual {n}", "duration": 5}
+            for n in range(1, 4)
+        ]
+    })
+    parts = [payload[i:i + 9] for i in range(0, len(payload), 9)]
+    stream = fake_stream(parts)
+    
+    with patch('scene_planner_ENHANCED.AsyncOpenAI', return_value=mock_openai_client):
+        planner = scene_planner_ENHANCED.ScenePlanner(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = stream
+        
+        seen = []
+        on_scene = lambda scene: seen.append((scene["scene_number"], stream.sent))
+        result = asyncio.run(planner.create_plan(sample_script, target_scenes=3, scene_duration=4, on_scene=on_scene))
+        
+        assert [number for number, _ in seen] == [1, 2, 3]
+        assert seen[0][1] < len(parts)
+        assert [scene["scene_number"] for scene in result["scenes"]] == [1, 2, 3]
+        for scene in result["scenes"]:
+            assert scene["duration"] == 4
+            assert scene["original_visual_description"].startswith("Visual")
+
+
+def test_enhanced_scene_planners_share_enhancer(mock_openai_client):
+    """Test enhanced planners reuse the module-level CinematicEnhancer"""
+    import scene_planner_ENHANCED
+    from cinematic_enhancer import get_enhancer
+    
+    with patch('scene_planner_ENHANCED.AsyncOpenAI', return_value=mock_openai_client):
+        first = scene_planner_ENHANCED.ScenePlanner(api_key="test-key")
+        second = scene_planner_ENHANCED.ScenePlanner(api_key="test-key")
+        
+        assert first.cinematic_enhancer is get_enhancer()
+        assert second.cinematic_enhancer is first.cinematic_enhancer
+
+
+def test_enhanced_scene_planning_releases_slot(mock_openai_client, sample_script, fake_stream):
+    """Test a retried stream open and a finished stream both give back their concurrency slot"""
+    import scene_planner_ENHANCED
+    from config import OPENAI_MAX_CONCURRENCY
+    
+    payload = json.dumps({
+        "scenes": [{"scene_number": 1, "narration": "Narration", "visual_description": "Visual", "duration": 5}]
+    })
+    connection_error = openai.APIConnectionError(
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    
+    with patch('scene_planner_ENHANCED.AsyncOpenAI', return_value=mock_openai_client):
+        planner = scene_planner_ENHANCED.ScenePlanner(api_key="test-key")
+        mock_openai_client.chat.completions.create.side_effect = [connection_error, fake_stream([payload])]
+        
+        result = asyncio.run(planner.create_plan(sample_script, target_scenes=1, on_scene=lambda scene: None))
+        
+        assert len(result["scenes"]) == 1
+        assert mock_openai_client.chat.completions.create.call_count == 2
+        assert planner._get_semaphore()._value == OPENAI_MAX_CONCURRENCY
+
+
+def test_enhanced_scene_planning_retries_dropped_stream(mock_openai_client, sample_script, fake_stream):
+    """Test a stream dropped mid-plan is retried without handing any scene over twice"""
+    import scene_planner_ENHANCED
+    
+    payload = json.dumps({
+        "scenes": [
+            {"scene_number": n, "narration": f"Narration {n}", "visual_description": f"Visual {n}", "duration": 5}
+            for n in range(1, 4)
+        ]
+    })
+    first_scene_end = payload.index("}") + 1
+    connection_error = openai.APIConnectionError(
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    
+    with patch('scene_planner_ENHANCED.AsyncOpenAI', return_value=mock_openai_client):
+        planner = scene_planner_ENHANCED.ScenePlanner(api_key="test-key")
+        # The first attempt drops right after scene 1 has streamed in
+        mock_openai_client.chat.completions.create.side_effect = [
+            fake_stream([payload[:first_scene_end + 2]], error=connection_error),
+            fake_stream([payload[i:i + 9] for i in range(0, len(payload), 9)])
+        ]
+        
+        seen = []
+        result = asyncio.run(planner.create_plan(
+            sample_script, target_scenes=3, on_scene=lambda scene: seen.append(scene["scene_number"])
+        ))
+        
+        assert seen == [1, 2, 3]
+        assert [scene["scene_number"] for scene in result["scenes"]] == [1, 2, 3]
+        assert mock_openai_client.chat.completions.create.call_count == 2
@@ -2,7 +2,10 @@
 Tests for script_generator module
 """
 import pytest
+import asyncio
 import json
+import httpx
+import openai
 from unittest.mock import Mock, patch
 from script_generator import ScriptGenerator
 
@@ -23,7 +26,7 @@ def test_script_generator_init_without_key():
 
 def test_script_generation_success(mock_openai_client, sample_user_prompt):
     """Test successful script generation"""
-    with patch('script_generator.OpenAI', return_value=mock_openai_client):
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
         generator = ScriptGenerator(api_key="test-key")
         
         # Mock the response
@@ -36,7 +39,7 @@ def test_script_generation_success(mock_openai_client, sample_user_prompt):
         mock_response.choices = [mock_choice]
         mock_openai_client.chat.completions.create.return_value = mock_response
         
-        result = generator.generate(sample_user_prompt)
+        result = asyncio.run(generator.generate(sample_user_prompt))
         
         assert "title" in result
         assert "script" in result
@@ -46,7 +49,7 @@ def test_script_generation_success(mock_openai_client, sample_user_prompt):
 
 def test_script_generation_invalid_json(mock_openai_client, sample_user_prompt):
     """Test script generation with invalid JSON response"""
-    with patch('script_generator.OpenAI', return_value=mock_openai_client):
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
         generator = ScriptGenerator(api_key="test-key")
         
         mock_response = Mock()
@@ -56,12 +59,12 @@ def test_script_generation_invalid_json(mock_openai_client, sample_user_prompt):
         mock_openai_client.chat.completions.create.return_value = mock_response
         
         with pytest.raises(ValueError, match="Failed to parse script"):
-            generator.generate(sample_user_prompt)
+            asyncio.run(generator.generate(sample_user_prompt))
 
 
 def test_script_generation_missing_fields(mock_openai_client, sample_user_prompt):
     """Test script generation with missing required fields"""
-    with patch('script_generator.OpenAI', return_value=mock_openai_client):
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
         generator = ScriptGenerator(api_key="test-key")
         
         mock_response = Mock()
@@ -71,15 +74,167 @@ def test_script_generation_missing_fields(mock_openai_client, sample_user_prompt
         mock_openai_client.chat.completions.create.return_value = mock_response
         
         with pytest.raises(ValueError, match="Invalid script structure"):
-            generator.generate(sample_user_prompt)
+            asyncio.run(generator.generate(sample_user_prompt))
 
 
 def test_script_generation_api_error(mock_openai_client, sample_user_prompt):
     """Test script generation with API error"""
-    with patch('script_generator.OpenAI', return_value=mock_openai_client):
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
         generator = ScriptGenerator(api_key="test-key")
         
         mock_openai_client.chat.completions.create.side_effect = Exception("API Error")
         
         with pytest.raises(RuntimeError, match="Script generation failed"):
-            generator.generate(sample_user_prompt)
+            asyncio.run(generator.generate(sample_user_prompt))
+
+
+def test_script_generation_static_prompt_prefix(mock_openai_client):
+    """Test the system prompt is byte-identical across calls and the topic comes last"""
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        
+        asyncio.run(generator.generate("How rainbows form"))
+        asyncio.run(generator.generate("How glaciers move"))
+        
+        first, second = [c.kwargs["messages"] for c in mock_openai_client.chat.completions.create.call_args_list]
+        assert first[0] == second[0]
+        assert first[0]["role"] == "system"
+        assert first[-1]["content"].endswith("How rainbows form")
+        assert second[-1]["content"].endswith("How glaciers move")
+
+
+def test_script_generation_retries_transient_errors(mock_openai_client, sample_user_prompt):
+    """Test transient API errors are retried instead of failing the run"""
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = json.dumps({"title": "Test", "script": "Test script."})
+        mock_response.choices = [mock_choice]
+        connection_error = openai.APIConnectionError(
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        )
+        mock_openai_client.chat.completions.create.side_effect = [connection_error, mock_response]
+        
+        result = asyncio.run(generator.generate(sample_user_prompt))
+        
+        assert result["title"] == "Test"
+        assert mock_openai_client.chat.completions.create.call_count == 2
+
+
+def test_script_generation_concurrency_cap(mock_openai_client, sample_user_prompt):
+    """Test concurrent generate calls respect OPENAI_MAX_CONCURRENCY"""
+    in_flight = 0
+    peak = 0
+    
+    mock_response = Mock()
+    mock_choice = Mock()
+    mock_choice.message.content = json.dumps({"title": "Test", "script": "Test script."})
+    mock_response.choices = [mock_choice]
+    
+    async def fake_create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return mock_response
+    
+    mock_openai_client.chat.completions.create.side_effect = fake_create
+    
+    async def generate_many():
+        return await asyncio.gather(*[generator.generate(sample_user_prompt) for _ in range(5)])
+    
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        with patch('clients.OPENAI_MAX_CONCURRENCY', 2):
+            generator = ScriptGenerator(api_key="test-key")
+            results = asyncio.run(generate_many())
+    
+    assert len(results) == 5
+    assert peak == 2
+
+
+def test_script_generation_streams_title_early(mock_openai_client, sample_user_prompt, fake_stream):
+    """Test on_title receives the title before the rest of the script has streamed"""
+    payload = json.dumps({
+        "title": "How \"Rainbows\" Form",
+        "script": "Rainbows appear when sunlight passes through water droplets."
+    })
+    parts = [payload[i:i + 7] for i in range(0, len(payload), 7)]
+    stream = fake_stream(parts)
+    
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = stream
+        
+        titles = []
+        on_title = lambda title: titles.append((title, stream.sent))
+        result = asyncio.run(generator.generate(sample_user_prompt, on_title=on_title))
+        
+        assert result["title"] == "How \"Rainbows\" Form"
+        assert titles[0][0] == "How \"Rainbows\" Form"
+        assert titles[0][1] < len(parts)
+        assert mock_openai_client.chat.completions.create.call_args[1]["stream"] is True
+        
+        # The streamed result was cached, so a repeat call makes no request
+        again = asyncio.run(generator.generate(sample_user_prompt, on_title=titles.append))
+        assert again == result
+        assert mock_openai_client.chat.completions.create.call_count == 1
+
+
+def test_script_generation_retries_dropped_stream(mock_openai_client, sample_user_prompt, fake_stream):
+    """Test a connection dropped mid-stream restarts the streamed request"""
+    payload = json.dumps({"title": "Rainbows", "script": "Light bends through droplets."})
+    parts = [payload[i:i + 7] for i in range(0, len(payload), 7)]
+    connection_error = openai.APIConnectionError(
+        request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        # The first attempt drops after the title has streamed in
+        mock_openai_client.chat.completions.create.side_effect = [
+            fake_stream(parts[:4], error=connection_error),
+            fake_stream(parts)
+        ]
+        
+        titles = []
+        result = asyncio.run(generator.generate(sample_user_prompt, on_title=titles.append))
+        
+        assert result == {"title": "Rainbows", "script": "Light bends through droplets."}
+        assert titles == ["Rainbows"]
+        assert mock_openai_client.chat.completions.create.call_count == 2
+
+
+def test_script_generation_refusal_is_not_retried(mock_openai_client, sample_user_prompt, fake_stream):
+    """Test a streamed refusal fails the request once, with the model's reason"""
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = fake_stream(
+            [], refusal="I can't help with that.")
+        
+        with pytest.raises(RuntimeError, match="Model refused the request: I can't help with that"):
+            asyncio.run(generator.generate(sample_user_prompt, on_title=print))
+        
+        assert mock_openai_client.chat.completions.create.call_count == 1
+
+
+def test_script_generation_uses_strict_schema(mock_openai_client, sample_user_prompt):
+    """Test requests carry a strict json_schema and off-schema responses are rejected"""
+    with patch('script_generator.AsyncOpenAI', return_value=mock_openai_client):
+        generator = ScriptGenerator(api_key="test-key")
+        
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = json.dumps({"title": "Rainbows", "script": "Light bends.", "extra": 1})
+        mock_response.choices = [mock_choice]
+        mock_openai_client.chat.completions.create.return_value = mock_response
+        
+        with pytest.raises(RuntimeError, match="Script generation failed"):
+            asyncio.run(generator.generate(sample_user_prompt))
+        
+        response_format = mock_openai_client.chat.completions.create.call_args[1]["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["strict"] is True
+        assert response_format["json_schema"]["schema"]["required"] == ["title", "script"]
@@ -0,0 +1,75 @@
+"""
+Tests for unified_planner module
+"""
+import pytest
+import asyncio
+import json
+from unittest.mock import Mock, patch
+from unified_planner import UnifiedScriptPlanner
+
+
+def unified_response(content):
+    mock_response = Mock()
+    mock_choice = Mock()
+    mock_choice.message.content = content
+    mock_response.choices = [mock_choice]
+    return mock_response
+
+
+def test_unified_planner_init_without_key():
+    """Test UnifiedScriptPlanner initialization without API key raises error"""
+    with patch('unified_planner.OPENAI_API_KEY', None):
+        with pytest.raises(ValueError, match="OpenAI API key is required"):
+            UnifiedScriptPlanner(api_key=None)
+
+
+def test_unified_planning_success(mock_openai_client, sample_user_prompt):
+    """Test one completion yields both the script and the enhanced scene plan"""
+    with patch('unified_planner.AsyncOpenAI', return_value=mock_openai_client):
+        planner = UnifiedScriptPlanner(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = unified_response(json.dumps({
+            "title": "How Rainbows Form",
+            "script": "Sunlight enters raindrops. The light splits into colors.",
+            "scenes": [
+                {"scene_number": 1, "narration": "Sunlight enters raindrops.", "visual_description": "Rain in sunlight", "duration": 6},
+                {"scene_number": 2, "narration": "The light splits into colors.", "visual_description": "A rainbow arc", "duration": 6}
+            ]
+        }))
+        
+        script_data, scene_plan = asyncio.run(planner.generate(sample_user_prompt, num_scenes=2, scene_duration=4))
+        
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        assert script_data == {
+            "title": "How Rainbows Form",
+            "script": "Sunlight enters raindrops. The light splits into colors."
+        }
+        assert len(scene_plan["scenes"]) == 2
+        for scene in scene_plan["scenes"]:
+            assert scene["duration"] == 4
+            assert "original_visual_description" in scene
+        
+        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
+        assert call_kwargs["response_format"]["json_schema"]["name"] == "VideoPlan"
+        assert call_kwargs["messages"][-1]["content"].endswith(sample_user_prompt)
+
+
+def test_unified_planning_missing_scenes(mock_openai_client, sample_user_prompt):
+    """Test a response without scenes is rejected"""
+    with patch('unified_planner.AsyncOpenAI', return_value=mock_openai_client):
+        planner = UnifiedScriptPlanner(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = unified_response(
+            json.dumps({"title": "Test", "script": "Test script"})
+        )
+        
+        with pytest.raises(RuntimeError, match="Invalid scene plan structure"):
+            asyncio.run(planner.generate(sample_user_prompt))
+
+
+def test_unified_planning_invalid_json(mock_openai_client, sample_user_prompt):
+    """Test unified planning with invalid JSON"""
+    with patch('unified_planner.AsyncOpenAI', return_value=mock_openai_client):
+        planner = UnifiedScriptPlanner(api_key="test-key")
+        mock_openai_client.chat.completions.create.return_value = unified_response("Invalid JSON")
+        
+        with pytest.raises(ValueError, match="Failed to parse unified plan"):
+            asyncio.run(planner.generate(sample_user_prompt))
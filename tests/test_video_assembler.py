@@ -2,7 +2,8 @@
 Tests for video_assembler module
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from pathlib import Path
 from video_assembler import VideoAssembler
 
@@ -29,14 +30,30 @@ def test_video_assembly_mock_mode(temp_dir, mock_video_clips):
         audio_path = temp_dir / "voiceover.mp3"
         audio_path.write_text("mock audio")
         
-        result = assembler.assemble(mock_video_clips, str(audio_path), temp_dir / "output.mp4")
+        result = asyncio.run(assembler.assemble(mock_video_clips, str(audio_path), temp_dir / "output.mp4"))
         
         assert Path(result).exists()
 
 
+def fake_ffmpeg_process(returncode=0, stderr=b""):
+    """Stand-in for an asyncio ffmpeg subprocess"""
+    proc = Mock()
+    proc.stderr = asyncio.StreamReader()
+    proc.stderr.feed_data(stderr)
+    proc.stderr.feed_eof()
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
+
+
 def test_video_assembly_with_ffmpeg(temp_dir, mock_video_clips):
     """Test video assembly with ffmpeg available"""
-    with patch('subprocess.run') as mock_run:
+    async def run_assembly(assembler, audio_path, output_path):
+        with patch('video_assembler.asyncio.create_subprocess_exec') as mock_exec:
+            mock_exec.side_effect = lambda *cmd, **kwargs: fake_ffmpeg_process()
+            result = await assembler.assemble(mock_video_clips, str(audio_path), output_path, work_dir=temp_dir)
+            return result, mock_exec
+    
+    with patch('subprocess.run') as mock_run, patch.object(VideoAssembler, '_find_ffmpeg', return_value="ffmpeg"):
         mock_run.return_value = Mock(returncode=0)
         
         assembler = VideoAssembler()
@@ -44,26 +61,53 @@ def test_video_assembly_with_ffmpeg(temp_dir, mock_video_clips):
         audio_path.write_text("mock audio")
         
         output_path = temp_dir / "output.mp4"
-        result = assembler.assemble(mock_video_clips, str(audio_path), output_path)
+        result, mock_exec = asyncio.run(run_assembly(assembler, audio_path, output_path))
         
         assert result == str(output_path)
-        # Verify ffmpeg was called
-        assert mock_run.called
+        # Verify ffmpeg was called for concat and audio mux
+        assert mock_exec.call_count == 2
 
 
 def test_video_assembly_ffmpeg_error(temp_dir, mock_video_clips):
     """Test video assembly falls back to mock on ffmpeg error"""
+    async def run_assembly(assembler, audio_path):
+        # ffmpeg concat fails
+        failed = lambda *cmd, **kwargs: fake_ffmpeg_process(1, b"concat: Invalid data found\n")
+        with patch('video_assembler.asyncio.create_subprocess_exec', side_effect=failed):
+            return await assembler.assemble(mock_video_clips, str(audio_path), temp_dir / "output.mp4", work_dir=temp_dir)
+    
     with patch('subprocess.run') as mock_run:
-        # First call (check) succeeds, subsequent calls fail
-        mock_run.side_effect = [
-            Mock(returncode=0),  # ffmpeg check
-            Mock(returncode=1)   # ffmpeg concat fails
-        ]
+        mock_run.return_value = Mock(returncode=0)  # ffmpeg check
         
         assembler = VideoAssembler()
         audio_path = temp_dir / "voiceover.mp3"
         audio_path.write_text("mock audio")
         
         # Should fall back to mock assembly
-        result = assembler.assemble(mock_video_clips, str(audio_path), temp_dir / "output.mp4")
+        result = asyncio.run(run_assembly(assembler, audio_path))
         assert Path(result).exists()
+
+
+def test_video_assembly_forwards_ffmpeg_progress(temp_dir, mock_video_clips):
+    """Test ffmpeg status lines (including \\r-rewritten ones) reach the progress callback"""
+    stderr = b"Input #0, concat\nframe=   10 fps=0.0 time=00:00:01.00\rframe=   20 fps=0.0 time=00:00:02.00\r"
+    
+    async def run_assembly(assembler, audio_path, lines):
+        with patch('video_assembler.asyncio.create_subprocess_exec',
+                   side_effect=lambda *cmd, **kwargs: fake_ffmpeg_process(0, stderr)):
+            return await assembler.assemble(
+                mock_video_clips, str(audio_path), temp_dir / "output.mp4",
+                work_dir=temp_dir, progress_callback=lines.append
+            )
+    
+    with patch('subprocess.run') as mock_run, patch.object(VideoAssembler, '_find_ffmpeg', return_value="ffmpeg"):
+        mock_run.return_value = Mock(returncode=0)
+        assembler = VideoAssembler()
+        audio_path = temp_dir / "voiceover.mp3"
+        audio_path.write_text("mock audio")
+        
+        lines = []
+        asyncio.run(run_assembly(assembler, audio_path, lines))
+        
+        assert "frame=   10 fps=0.0 time=00:00:01.00" in lines
+        assert "frame=   20 fps=0.0 time=00:00:02.00" in lines
@@ -1,6 +1,7 @@
 """
 Tests for video_generator module
 """
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, mock_open
 from pathlib import Path
@@ -16,7 +17,7 @@ def test_video_generator_init():
 def test_video_generator_mock_mode(temp_dir, sample_scene_plan):
     """Test video generation in mock mode"""
     generator = VideoGenerator(api_key=None)
-    result = generator.generate_clips(sample_scene_plan, output_dir=temp_dir)
+    result = asyncio.run(generator.generate_clips(sample_scene_plan, output_dir=temp_dir))
     
     assert len(result) == len(sample_scene_plan["scenes"])
     for clip_path in result:
@@ -31,7 +32,7 @@ def test_video_generation_text_to_video(temp_dir, sample_scene_plan, mock_replic
             
             mock_replicate_client.run.return_value = "https://example.com/video.mp4"
             
-            result = generator.generate_clips(sample_scene_plan, output_dir=temp_dir)
+            result = asyncio.run(generator.generate_clips(sample_scene_plan, output_dir=temp_dir))
             
             assert len(result) == len(sample_scene_plan["scenes"])
             mock_replicate_client.run.assert_called()
@@ -45,11 +46,11 @@ def test_video_generation_image_to_video(temp_dir, sample_scene_plan, mock_story
             
             mock_replicate_client.run.return_value = "https://example.com/video.mp4"
             
-            result = generator.generate_clips(
+            result = asyncio.run(generator.generate_clips(
                 sample_scene_plan, 
                 output_dir=temp_dir,
                 storyboard_images=mock_storyboard_images
-            )
+            ))
             
             assert len(result) == len(sample_scene_plan["scenes"])
             # Verify image-to-video was called (check for image parameter)
@@ -60,7 +61,7 @@ def test_video_generation_image_to_video(temp_dir, sample_scene_plan, mock_story
 def test_video_generation_no_api_key(temp_dir, sample_scene_plan):
     """Test video generation falls back to mock when no API key"""
     generator = VideoGenerator(api_key=None)
-    result = generator.generate_clips(sample_scene_plan, output_dir=temp_dir)
+    result = asyncio.run(generator.generate_clips(sample_scene_plan, output_dir=temp_dir))
     
     # Should fall back to mock mode
     assert len(result) == len(sample_scene_plan["scenes"])
@@ -74,7 +75,7 @@ def test_video_generation_stability_provider(temp_dir, sample_scene_plan, mock_r
             
             mock_replicate_client.run.return_value = "https://example.com/video.mp4"
             
-            result = generator.generate_clips(sample_scene_plan, output_dir=temp_dir)
+            result = asyncio.run(generator.generate_clips(sample_scene_plan, output_dir=temp_dir))
             
             assert len(result) == len(sample_scene_plan["scenes"])
 
@@ -83,5 +84,55 @@ def test_video_generator_invalid_provider(temp_dir, sample_scene_plan):
     """Test video generator with invalid provider falls back to mock"""
     generator = VideoGenerator(api_key="test-key")
     
-    result = generator.generate_clips(sample_scene_plan, output_dir=temp_dir)
+    result = asyncio.run(generator.generate_clips(sample_scene_plan, output_dir=temp_dir))
     assert len(result) == len(sample_scene_plan["scenes"])
+
+
+def test_video_generation_concurrent_scenes_keep_order(temp_dir):
+    """Test scenes are generated concurrently under the cap and returned in scene order"""
+    import threading
+    import time
+    
+    scene_plan = {
+        "scenes": [
+            {"scene_number": n, "visual_description": f"Scene {n}", "duration": 5}
+            for n in range(1, 6)
+        ]
+    }
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+    
+    def fake_clip(description, duration, scene_number, output_dir, storyboard_image=None):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        # Later scenes finish first to check ordering
+        time.sleep(0.05 * (6 - scene_number))
+        with lock:
+            state["active"] -= 1
+        return str(output_dir / f"scene_{scene_number}.mp4")
+    
+    with patch('video_generator.VIDEO_CONCURRENCY', 2):
+        generator = VideoGenerator(api_key="test-key")
+        with patch.object(generator, '_generate_clip', side_effect=fake_clip):
+            result = asyncio.run(generator.generate_clips(scene_plan, output_dir=temp_dir))
+    
+    assert result == [str(temp_dir / f"scene_{n}.mp4") for n in range(1, 6)]
+    assert state["peak"] == 2
+
+
+def test_video_generator_warmup_reuses_client(temp_dir, sample_scene_plan, mock_storyboard_images, mock_replicate_client, mock_requests_get):
+    """Test warmup prepares the Replicate client that clip generation then reuses"""
+    with patch('video_generator.replicate.Client', return_value=mock_replicate_client) as mock_client_cls:
+        with patch('requests.get', return_value=mock_requests_get):
+            generator = VideoGenerator(api_key="test-key")
+            generator.warmup()
+            mock_replicate_client.models.get.assert_called_once_with(generator.svd_model)
+            
+            asyncio.run(generator.generate_clips(
+                sample_scene_plan,
+                output_dir=temp_dir,
+                storyboard_images=mock_storyboard_images
+            ))
+            
+            assert mock_client_cls.call_count == 1
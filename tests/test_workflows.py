@@ -46,7 +46,7 @@ def test_workflow_a_text_to_video(temp_dir, sample_user_prompt):
                             use_storyboard=False
                         )
                         
-                        result = pipeline.run(sample_user_prompt)
+                        result = pipeline.run_sync(sample_user_prompt)
                         
                         assert result["success"] == True
                         # Verify storyboard was NOT called
@@ -96,7 +96,7 @@ def test_workflow_b_storyboard_guided(temp_dir, sample_user_prompt):
                                 use_storyboard=True
                             )
                             
-                            result = pipeline.run(sample_user_prompt)
+                            result = pipeline.run_sync(sample_user_prompt)
                             
                             assert result["success"] == True
                             # Verify storyboard was generated
@@ -130,5 +130,5 @@ def test_workflow_replicate_provider(temp_dir, sample_user_prompt):
                             tts_provider="mock"
                         )
                         
-                        result = pipeline.run(sample_user_prompt)
+                        result = pipeline.run_sync(sample_user_prompt)
                         assert result["success"] == True
@@ -0,0 +1,110 @@
+"""
+Unified planning module - writes the script and plans its scenes in one LLM call
+Used by the pipeline instead of ScriptGenerator + ScenePlanner when USE_UNIFIED is set
+"""
+from openai import AsyncOpenAI
+import asyncio
+import json
+from config import OPENAI_API_KEY, UNIFIED_MAX_TOKENS, TARGET_SCENES, safe_print
+from clients import JSONCompletionMixin
+from system_prompts import CinematicSystemPrompts
+from schemas import VideoPlan, response_format, validate_scenes
+from cinematic_enhancer import get_enhancer
+
+
+REQUEST_OPTIONS = {
+    "max_tokens": UNIFIED_MAX_TOKENS,
+    "response_format": response_format(VideoPlan),
+}
+
+
+class UnifiedScriptPlanner(JSONCompletionMixin):
+    REQUEST_OPTIONS = REQUEST_OPTIONS
+
+    def __init__(self, api_key=None, use_cinematic_enhancement=True, client=None):
+        """
+        Initialize unified planner
+
+        Args:
+            api_key: OpenAI API key
+            use_cinematic_enhancement: If True, enhance visual descriptions with
+                                      cinematic vocabulary (local, no extra API call)
+            client: Optional shared AsyncOpenAI client (see clients.py)
+        """
+        self.api_key = api_key or OPENAI_API_KEY
+        if not self.api_key:
+            raise ValueError("OpenAI API key is required")
+        self.client = client or AsyncOpenAI(api_key=self.api_key, max_retries=0)
+
+        self.use_cinematic_enhancement = use_cinematic_enhancement
+        self.cinematic_enhancer = get_enhancer() if use_cinematic_enhancement else None
+
+    def _validate(self, plan):
+        """Reject responses without a title, script or complete scenes"""
+        if not plan.get("title") or not plan.get("script"):
+            raise ValueError(f"Invalid script structure returned. Expected 'title' and 'script' fields, but got: {list(plan.keys())}")
+
+        validate_scenes(plan.get("scenes"))
+        VideoPlan.model_validate(plan)
+
+    async def generate(self, user_prompt, num_scenes=None, scene_duration=None, bypass_cache=False):
+        """
+        Generate a script and its scene plan from a single completion
+
+        Args:
+            user_prompt (str): User's description of desired video
+            num_scenes (int): Number of scenes to create
+            scene_duration (int): Duration per scene in seconds
+            bypass_cache (bool): Ignore any cached response for this request
+
+        Returns:
+            tuple: (script_data, scene_plan) in the same shapes ScriptGenerator.generate
+                   and ScenePlanner.create_plan return
+        """
+        safe_print("📝 Generating script and scene plan...")
+
+        ts = num_scenes or TARGET_SCENES
+        sd = scene_duration or 6
+        if sd > 12:
+            sd = 12
+
+        # Static instructions live in the system message; only this trailing
+        # user message varies per request, keeping the prompt prefix cacheable
+        prompt = f"""Break the video into {ts} scenes. Each scene should be {sd} seconds.
+
+TOPIC: {user_prompt}"""
+
+        try:
+            plan = await self._call_openai([
+                {"role": "system", "content": CinematicSystemPrompts.get_unified_planning_prompt()},
+                {"role": "user", "content": prompt}
+            ], bypass_cache=bypass_cache)
+
+            script_data = {"title": plan["title"], "script": plan["script"]}
+            scene_plan = {"scenes": plan["scenes"]}
+
+            for scene in scene_plan["scenes"]:
+                scene["duration"] = sd
+
+            safe_print("✅ Script generated: '%s' (%s scenes)", script_data['title'], len(scene_plan['scenes']))
+
+            if self.use_cinematic_enhancement and self.cinematic_enhancer:
+                safe_print("🎥 Enhancing scenes with cinematic prompting...")
+                scene_plan = self.cinematic_enhancer.enhance_scene_plan(
+                    scene_plan,
+                    original_user_prompt=script_data['title']
+                )
+
+            return script_data, scene_plan
+
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse unified plan: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Unified planning failed: {e}")
+
+
+if __name__ == "__main__":
+    # Test the unified planner
+    planner = UnifiedScriptPlanner()
+    script, plan = asyncio.run(planner.generate("Explain how rainbows form", num_scenes=3))
+    print(json.dumps({"script": script, "plan": plan}, indent=2))
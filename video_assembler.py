@@ -1,20 +1,14 @@
 """
 Video assembly module - combines clips and audio into final video
 """
+import asyncio
 import subprocess
 import os
+import re
 import shutil
+from collections import deque
 from pathlib import Path
-from config import OUTPUT_DIR, TEMP_DIR
-
-
-def safe_print(*args, **kwargs):
-    """Safely print messages, handling closed file errors in Streamlit"""
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        # Silently fail if stdout is closed (Streamlit context)
-        pass
+from config import OUTPUT_DIR, TEMP_DIR, safe_print
 
 
 class VideoAssembler:
@@ -60,14 +54,20 @@ class VideoAssembler:
                 return c
         return None
     
-    def assemble(self, clip_paths, audio_path, output_path=None):
+    async def assemble(self, clip_paths, audio_path, output_path=None, work_dir=None, progress_callback=None):
         """
         Combine video clips and audio into final video
         
+        ffmpeg runs as an asyncio subprocess, so the event loop stays free while
+        it encodes.
+        
         Args:
             clip_paths (list): List of video clip file paths
             audio_path (str): Path to audio file
             output_path (str): Path for final output video
+            work_dir (Path): Directory for intermediate files (default: TEMP_DIR)
+            progress_callback (callable): Optional callback given each ffmpeg
+                status line (e.g. "frame=  120 fps= 60 ... time=00:00:05.00")
             
         Returns:
             str: Path to assembled video
@@ -78,32 +78,62 @@ class VideoAssembler:
         output_path = output_path or str(OUTPUT_DIR / "final_video.mp4")
         output_path = Path(output_path)
         output_path.parent.mkdir(exist_ok=True)
+        work_dir = Path(work_dir or TEMP_DIR)
+        work_dir.mkdir(exist_ok=True)
         
         safe_print("🎞️  Assembling video...")
         
         try:
             # Step 1: Concatenate video clips
-            concat_path = TEMP_DIR / "concatenated.mp4"
-            self._concatenate_clips(clip_paths, concat_path)
+            concat_path = work_dir / "concatenated.mp4"
+            await self._concatenate_clips(clip_paths, concat_path, progress_callback)
             
             # Step 2: Add audio to video
-            self._add_audio(concat_path, audio_path, output_path)
+            await self._add_audio(concat_path, audio_path, output_path, progress_callback)
             
             # Cleanup temp file
             if concat_path.exists():
                 concat_path.unlink()
             
-            safe_print(f"✅ Video assembled: {output_path}")
+            safe_print("✅ Video assembled: %s", output_path)
             return str(output_path)
             
         except Exception as e:
-            safe_print(f"❌ Assembly failed: {e}")
+            safe_print("❌ Assembly failed: %s", e)
             return self._mock_assemble(clip_paths, audio_path, output_path)
     
-    def _concatenate_clips(self, clip_paths, output_path):
+    async def _run_ffmpeg(self, cmd, progress_callback=None):
+        """Run an ffmpeg command, forwarding its stderr status lines as they arrive"""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        recent = deque(maxlen=20)  # kept for the error message
+        pending = b""
+        while True:
+            chunk = await proc.stderr.read(4096)
+            if not chunk:
+                break
+            # ffmpeg rewrites its progress line with \r, so split on both line endings
+            *lines, pending = re.split(rb"[\r\n]", pending + chunk)
+            for line in lines:
+                text = line.decode("utf-8", errors="replace").strip()
+                if text:
+                    recent.append(text)
+                    if progress_callback:
+                        progress_callback(text)
+        
+        returncode = await proc.wait()
+        if returncode != 0:
+            detail = recent[-1] if recent else "no output"
+            raise RuntimeError(f"ffmpeg exited with code {returncode}: {detail}")
+    
+    async def _concatenate_clips(self, clip_paths, output_path, progress_callback=None):
         """Concatenate multiple video clips"""
-        # Create file list for ffmpeg
-        list_path = TEMP_DIR / "clips_list.txt"
+        # Create file list for ffmpeg next to the concatenated output
+        list_path = Path(output_path).parent / "clips_list.txt"
         
         with open(list_path, 'w', encoding='utf-8') as f:
             for clip in clip_paths:
@@ -113,7 +143,7 @@ class VideoAssembler:
         
         # Concatenate using ffmpeg
         cmd = [
-            self.ffmpeg_cmd, "-y",
+            self.ffmpeg_cmd, "-y", "-hide_banner",
             "-f", "concat",
             "-safe", "0",
             "-i", str(list_path),
@@ -121,15 +151,16 @@ class VideoAssembler:
             str(output_path)
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        # Cleanup
-        list_path.unlink()
+        try:
+            await self._run_ffmpeg(cmd, progress_callback)
+        finally:
+            # Cleanup
+            list_path.unlink()
     
-    def _add_audio(self, video_path, audio_path, output_path):
+    async def _add_audio(self, video_path, audio_path, output_path, progress_callback=None):
         """Add audio track to video"""
         cmd = [
-            self.ffmpeg_cmd, "-y",
+            self.ffmpeg_cmd, "-y", "-hide_banner",
             "-i", str(video_path),
             "-i", str(audio_path),
             "-c:v", "copy",
@@ -138,7 +169,7 @@ class VideoAssembler:
             str(output_path)
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
+        await self._run_ffmpeg(cmd, progress_callback)
     
     def _mock_assemble(self, clip_paths, audio_path, output_path):
         """
@@ -158,7 +189,7 @@ class VideoAssembler:
             f.write(f"\nAudio Track:\n  {audio_path}\n")
             f.write("\n(Install ffmpeg to generate actual video)\n")
         
-        safe_print(f"✅ Mock assembly created: {output_path}")
+        safe_print("✅ Mock assembly created: %s", output_path)
         return str(output_path)
 
 
@@ -171,5 +202,5 @@ if __name__ == "__main__":
     ]
     test_audio = "/home/claude/temp/voiceover.mp3"
     
-    output = assembler.assemble(test_clips, test_audio, "test_output.mp4")
+    output = asyncio.run(assembler.assemble(test_clips, test_audio, "test_output.mp4"))
     print(f"Assembled: {output}")
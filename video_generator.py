@@ -4,6 +4,8 @@ Generates clips per scene using:
 - Text-to-Image: stability-ai/sdxl
 - Image-to-Video: stability-ai/stable-video-diffusion
 """
+import asyncio
+import threading
 import replicate
 import requests
 from pathlib import Path
@@ -12,28 +14,42 @@ from config import (
     STABILITY_MODEL,
     STORYBOARD_MODEL,
     TEMP_DIR,
+    VIDEO_CONCURRENCY,
+    safe_print,
 )
 
 
-def safe_print(*args, **kwargs):
-    """Safely print messages, handling closed file errors in Streamlit"""
-    try:
-        print(*args, **kwargs)
-    except (IOError, OSError, ValueError):
-        # Silently fail if stdout is closed (Streamlit context)
-        pass
-
-
 class VideoGenerator:
     def __init__(self, api_key=None, svd_model=None, sdxl_model=None):
         self.api_key = api_key or REPLICATE_API_KEY
         self.svd_model = svd_model or STABILITY_MODEL
         self.sdxl_model = sdxl_model or STORYBOARD_MODEL
+        self._client = None
+        self._client_lock = threading.Lock()
+    
+    def _get_client(self):
+        """Replicate client shared by every scene, so its HTTP connections are reused"""
+        with self._client_lock:
+            if self._client is None:
+                replicate_key = self.api_key or REPLICATE_API_KEY
+                if not replicate_key:
+                    raise RuntimeError("Replicate API key is required")
+                self._client = replicate.Client(api_token=replicate_key)
+            return self._client
+    
+    def warmup(self):
+        """Open the Replicate connection and fetch model metadata before the first clip"""
+        if not (self.api_key or REPLICATE_API_KEY):
+            return
+        self._get_client().models.get(self.svd_model.split(":")[0])
     
-    def generate_clips(self, scene_plan, output_dir=None, storyboard_images=None):
+    async def generate_clips(self, scene_plan, output_dir=None, storyboard_images=None):
         """
         Generate video clips for all scenes
         
+        Scenes are generated concurrently (up to VIDEO_CONCURRENCY at a time);
+        the returned paths are in scene order.
+        
         Args:
             scene_plan (dict): Scene plan with visual descriptions
             output_dir (Path): Directory to save clips
@@ -46,38 +62,40 @@ class VideoGenerator:
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True)
         
-        safe_print(f"🎥 Generating {len(scene_plan['scenes'])} video clips...")
+        safe_print("🎥 Generating %s video clips...", len(scene_plan['scenes']))
         
-        clip_paths = []
+        semaphore = asyncio.Semaphore(VIDEO_CONCURRENCY)
+        tasks = []
         
         for idx, scene in enumerate(scene_plan['scenes']):
-            safe_print(f"  Scene {scene['scene_number']}: {scene['visual_description'][:50]}...")
-            
             # Get corresponding storyboard image if available
             storyboard_image = None
             if storyboard_images and idx < len(storyboard_images):
                 storyboard_image = storyboard_images[idx]
             
-            clip_path = self._generate_clip(
+            tasks.append(self._generate_scene_clip(scene, output_dir, storyboard_image, semaphore))
+        
+        clip_paths = list(await asyncio.gather(*tasks))
+        
+        safe_print("✅ Generated %s clips", len(clip_paths))
+        return clip_paths
+    
+    async def _generate_scene_clip(self, scene, output_dir, storyboard_image, semaphore):
+        """Generate one scene's clip in a worker thread, bounded by the shared semaphore"""
+        async with semaphore:
+            safe_print("  Scene %s: %.50s...", scene['scene_number'], scene['visual_description'])
+            return await asyncio.to_thread(
+                self._generate_clip,
                 description=scene['visual_description'],
                 duration=scene['duration'],
                 scene_number=scene['scene_number'],
                 output_dir=output_dir,
                 storyboard_image=storyboard_image
             )
-            
-            clip_paths.append(clip_path)
-        
-        safe_print(f"✅ Generated {len(clip_paths)} clips")
-        return clip_paths
     
     def _generate_clip(self, description, duration, scene_number, output_dir, storyboard_image=None):
         """Generate a single clip using Stability models via Replicate"""
-        replicate_key = self.api_key or REPLICATE_API_KEY
-        if not replicate_key:
-            raise RuntimeError("Replicate API key is required")
-
-        client = replicate.Client(api_token=replicate_key)
+        client = self._get_client()
         clip_path = output_dir / f"scene_{scene_number}.mp4"
 
         # Ensure we have an image: use provided storyboard or create one from text
@@ -153,7 +171,7 @@ class VideoGenerator:
         if not video_url:
             raise RuntimeError("No video URL returned from image-to-video model")
         self._download_video(video_url, clip_path)
-        safe_print(f"    ✅ Video saved: {clip_path.name}")
+        safe_print("    ✅ Video saved: %s", clip_path.name)
         return str(clip_path)
     
     def _download_video(self, url, output_path):
@@ -305,6 +323,6 @@ if __name__ == "__main__":
             }
         ]
     }
-    clips = generator.generate_clips(test_plan)
+    clips = asyncio.run(generator.generate_clips(test_plan))
     print(f"Generated clips: {clips}")
 